@@ -0,0 +1,112 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import typing as t
+
+__author__ = "EUROCONTROL (SWIM)"
+
+# Tracks the startup cost of the package: for each scenario fresh interpreters perform the imports and report the
+# time they took, the memory they allocated and whether the HTTP transports (requests) were loaded.
+#
+#     python benchmarks/import_time.py [--runs 10] [--json]
+
+DESCRIPTION = "Measures the import time and memory of rest_client"
+
+SCENARIOS = {
+    'models': 'from rest_client import BaseModel',
+    'requestor': 'from rest_client import Requestor, Endpoint',
+    'client_factory': 'from rest_client import ClientFactory, RequestHandler',
+}
+
+# memory is traced in a separate run since tracing slows down the imports considerably
+_TIME_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'time': elapsed, 'modules': len(sys.modules), 'requests': 'requests' in sys.modules}}))
+"""
+
+_MEMORY_PROBE = """
+import json, tracemalloc
+tracemalloc.start()
+{statement}
+print(json.dumps({{'memory': tracemalloc.get_traced_memory()[1]}}))
+"""
+
+
+def _probe(probe: str, statement: str) -> t.Dict[str, t.Any]:
+    output = subprocess.run([sys.executable, '-c', probe.format(statement=statement)],
+                            check=True, capture_output=True, text=True).stdout
+
+    return json.loads(output)
+
+
+def measure(statement: str, runs: int) -> t.Dict[str, t.Any]:
+    """
+    :param statement: the import statement to measure
+    :param runs: how many fresh interpreters to measure it in
+    :return: the median time (ms), the peak allocated memory (KiB) and the amount of loaded modules
+    """
+    results = [_probe(_TIME_PROBE, statement) for _ in range(runs)]
+    memory = _probe(_MEMORY_PROBE, statement)['memory']
+
+    return {
+        'time_ms': round(statistics.median(r['time'] for r in results) * 1000, 2),
+        'memory_kib': round(memory / 1024, 1),
+        'modules': results[-1]['modules'],
+        'requests_loaded': results[-1]['requests'],
+    }
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument('--runs', type=int, default=10, help="fresh interpreters per scenario")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {name: measure(statement, args.runs) for name, statement in SCENARIOS.items()}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'scenario':<16}{'time (ms)':>12}{'memory (KiB)':>15}{'modules':>10}{'requests':>10}")
+    for name, result in results.items():
+        print(f"{name:<16}{result['time_ms']:>12}{result['memory_kib']:>15}{result['modules']:>10}"
+              f"{str(result['requests_loaded']):>10}")
+
+
+if __name__ == '__main__':
+    main()
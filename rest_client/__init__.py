@@ -30,7 +30,39 @@ Details on EUROCONTROL: http://www.eurocontrol.int
 
 __author__ = "EUROCONTROL (SWIM)"
 
+import importlib
+import typing as t
+
 from rest_client.models import BaseModel
-from rest_client.client_factory import ClientFactory
-from rest_client.requestor import Requestor
-from rest_client.request_handler import RequestHandler
+
+# the rest of the public API is imported upon first access so that importing the package (i.e. for its models) does
+# not load the HTTP transports
+_LAZY_ATTRIBUTES = {
+    'ClientFactory': 'rest_client.client_factory',
+    'Requestor': 'rest_client.requestor',
+    'RequestHandler': 'rest_client.request_handler',
+    'Endpoint': 'rest_client.endpoints',
+}
+
+__all__ = ['BaseModel', *_LAZY_ATTRIBUTES]
+
+if t.TYPE_CHECKING:
+    from rest_client.client_factory import ClientFactory
+    from rest_client.requestor import Requestor
+    from rest_client.request_handler import RequestHandler
+    from rest_client.endpoints import Endpoint
+
+
+def __getattr__(name: str) -> t.Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> t.List[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
@@ -29,7 +29,9 @@ Details on EUROCONTROL: http://www.eurocontrol.int
 """
 import typing as t
 
-from rest_client.request_handler import RequestHandler
+from rest_client.limiter import AdaptiveLimiter
+from rest_client.priority import PriorityDispatcher
+from rest_client.transports import HTTP2Session
 from rest_client.typing import RestClient
 
 __author__ = "EUROCONTROL (SWIM)"
@@ -42,12 +44,19 @@ class ClientFactory:
     def create(cls,
                host: str,
                https: bool = True,
-               timeout: t.Optional[int] = None,
+               timeout: t.Optional[float] = 30,
                username: t.Optional[str] = None,
                password: t.Optional[str] = None,
                cert: t.Optional[t.Union[str, t.Tuple[str, str]]] = None,
                verify: t.Optional[t.Union[bool, str]] = True,
                retry: t.Optional[t.Union[int, None]] = None,
+               http2: bool = False,
+               request_handler_maker: t.Optional[t.Callable] = None,
+               connect_timeout: t.Optional[float] = None,
+               read_timeout: t.Optional[float] = None,
+               deadline: t.Optional[float] = None,
+               limiter: t.Optional[AdaptiveLimiter] = None,
+               dispatcher: t.Optional[PriorityDispatcher] = None,
                **kwargs: str) -> t.Type[RestClient]:
         """
         To be used from a REST client class that inherits from ClientFactory. The returned class will be an instance of
@@ -55,24 +64,45 @@ class ClientFactory:
 
         :param host: the host provider of the API
         :param https: indicates whether the host serves over TSL or not
-        :param timeout: How many seconds to wait for the server to send data before giving up
+        :param timeout: How many seconds to wait for the server to send data before giving up. If None it waits
+                        forever
         :param username: username for basic authentication
         :param password: password for basic authentication
         :param cert: SSL client certificate
         :param verify: SSL verification
         :param retry: amount of times to retry to connect to the server in case of ConnectionError. If None no retry will
                       take place
+        :param http2: if True the requests will be multiplexed over an HTTP/2 connection (requires httpx[http2])
+        :param request_handler_maker: a callback which instantiates a custom request handler (transport). Takes
+                                      precedence over `http2`
+        :param connect_timeout: How many seconds to wait for the connection to be established. Overrides `timeout`
+        :param read_timeout: How many seconds to wait between bytes sent by the server. Overrides `timeout`
+        :param deadline: How many seconds a call may take overall, including retries and backoff
+        :param limiter: limits adaptively the amount of in-flight requests towards the host
+        :param dispatcher: shares the request slots among the priority classes of the requests
         :param kwargs: optional arguments
         :return: an instance of a REST client that will inherit from ClientFactory
         """
+        # imported upon first use as it loads requests
+        from rest_client.request_handler import RequestHandler
+
         auth = (username, password) if username and password else ()
 
+        if request_handler_maker is None and http2:
+            request_handler_maker = HTTP2Session
+
         request_handler = RequestHandler(host=host,
                                          https=https,
                                          timeout=timeout,
                                          auth=auth,
                                          cert=cert,
                                          verify=verify,
-                                         retry=retry)
+                                         retry=retry,
+                                         request_handler_maker=request_handler_maker,
+                                         connect_timeout=connect_timeout,
+                                         read_timeout=read_timeout,
+                                         deadline=deadline,
+                                         limiter=limiter,
+                                         dispatcher=dispatcher)
 
         return cls(request_handler, **kwargs)
@@ -0,0 +1,147 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import array
+import importlib
+import importlib.util
+import math
+import typing as t
+from operator import itemgetter
+
+from rest_client.typing import JSONType
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+# the supported column types and their counterparts per backend
+_NUMPY_DTYPES = {int: 'int64', float: 'float64', bool: 'bool', str: 'object'}
+_ARROW_TYPES = {int: 'int64', float: 'float64', bool: 'bool_', str: 'string'}
+_ARRAY_TYPECODES = {int: 'q', float: 'd'}
+
+BACKENDS = ('auto', 'numpy', 'pandas', 'arrow', 'python')
+
+
+def _import_optional(module_name: str, backend: str) -> t.Any:
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(f"The '{backend}' columnar backend requires the '{module_name}' package") from e
+
+
+class ColumnSchema:
+    """
+        Declares the columns of a homogeneous list response, so that it can be decoded directly into column arrays
+        instead of one BaseModel per row:
+
+            schema = ColumnSchema({'id': int, 'lat': float, 'lon': float, 'callsign': str}, backend='numpy')
+            columns = client.perform_request('GET', 'flights', columns=schema)
+            columns['lat'].mean()
+
+        Backends:
+        - numpy: dict of numpy arrays
+        - pandas: pandas.DataFrame
+        - arrow: pyarrow.Table
+        - python: dict of array.array for int and float columns and of lists otherwise
+        - auto: numpy if available, python otherwise
+
+        Every row must contain every declared column. None values of float columns are decoded as NaN and of str
+        columns as None. The arrow backend keeps None values of every column as nulls, while the other backends
+        raise ValueError on None values of int and bool columns since numpy has no null integer or boolean.
+    """
+
+    def __init__(self, columns: t.Dict[str, type], backend: str = 'auto') -> None:
+        """
+        :param columns: the name and the type (int, float, bool or str) of each column
+        :param backend: one of auto, numpy, pandas, arrow, python
+        """
+        for name, column_type in columns.items():
+            if column_type not in _NUMPY_DTYPES:
+                raise ValueError(f"Unsupported type of column '{name}': {column_type}")
+
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported backend: {backend}")
+
+        self.columns: t.Dict[str, type] = dict(columns)
+        self.backend: str = backend
+
+    def decode(self, rows: t.Optional[JSONType]) -> t.Any:
+        """
+        :param rows: the decoded JSON array of objects
+        :return: the columns in the format of the backend
+        """
+        rows = rows or []
+
+        backend = self.backend
+        if backend == 'auto':
+            backend = 'numpy' if importlib.util.find_spec('numpy') is not None else 'python'
+
+        return getattr(self, f'_decode_{backend}')(rows)
+
+    def _values(self, rows: t.List[t.Dict[str, t.Any]], name: str) -> t.Iterable[t.Any]:
+        values = map(itemgetter(name), rows)
+        column_type = self.columns[name]
+
+        if column_type is float:
+            return (math.nan if value is None else value for value in values)
+
+        if column_type in (int, bool):
+            values = list(values)
+            if None in values:
+                raise ValueError(f"Column '{name}' of type {column_type.__name__} contains null values; declare it as "
+                                 f"float or use the arrow backend")
+
+        return values
+
+    def _decode_numpy(self, rows: t.List[t.Dict[str, t.Any]]) -> t.Dict[str, t.Any]:
+        np = _import_optional('numpy', 'numpy')
+
+        return {
+            name: np.fromiter(self._values(rows, name), dtype=_NUMPY_DTYPES[column_type], count=len(rows))
+            for name, column_type in self.columns.items()
+        }
+
+    def _decode_pandas(self, rows: t.List[t.Dict[str, t.Any]]) -> t.Any:
+        pd = _import_optional('pandas', 'pandas')
+
+        return pd.DataFrame(self._decode_numpy(rows), columns=list(self.columns))
+
+    def _decode_arrow(self, rows: t.List[t.Dict[str, t.Any]]) -> t.Any:
+        pa = _import_optional('pyarrow', 'arrow')
+
+        return pa.table({
+            name: pa.array(list(map(itemgetter(name), rows)), type=getattr(pa, _ARROW_TYPES[column_type])())
+            for name, column_type in self.columns.items()
+        })
+
+    def _decode_python(self, rows: t.List[t.Dict[str, t.Any]]) -> t.Dict[str, t.Union[array.array, t.List[t.Any]]]:
+        return {
+            name: array.array(_ARRAY_TYPECODES[column_type], self._values(rows, name))
+            if column_type in _ARRAY_TYPECODES else list(self._values(rows, name))
+            for name, column_type in self.columns.items()
+        }
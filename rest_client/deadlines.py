@@ -0,0 +1,91 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import time
+import typing as t
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rest_client.errors import DeadlineExceeded
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+# the absolute point in time (as per time.monotonic) by which the requests of the current context must complete
+_current_deadline: ContextVar[t.Optional[float]] = ContextVar('rest_client_deadline', default=None)
+
+
+@contextmanager
+def deadline(seconds: t.Optional[float]) -> t.Iterator[None]:
+    """
+    Bounds every request performed within the block, including its retries and backoff, to the given amount of
+    seconds. Nested deadlines can only shorten the enclosing one.
+
+        with deadline(2.5):
+            client.get_user(user_id=1)
+            client.get_groups()
+
+    :param seconds: the time budget of the block. If None the enclosing deadline, if any, applies
+    """
+    if seconds is None:
+        yield
+        return
+
+    expires_at = time.monotonic() + seconds
+    current = _current_deadline.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+
+    token = _current_deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def remaining() -> t.Optional[float]:
+    """
+    :return: how many seconds are left until the deadline of the current context or None if there is no deadline
+    """
+    expires_at = _current_deadline.get()
+
+    return None if expires_at is None else expires_at - time.monotonic()
+
+
+def check_deadline() -> t.Optional[float]:
+    """
+    :return: how many seconds are left until the deadline of the current context or None if there is no deadline
+    :raises: DeadlineExceeded
+    """
+    seconds = remaining()
+
+    if seconds is not None and seconds <= 0:
+        raise DeadlineExceeded()
+
+    return seconds
@@ -0,0 +1,322 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import typing as t
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+# The index is a memory-mapped, fixed size, open addressing hash table shared by all the processes using the cache
+# directory:
+#
+#     header: MAGIC, slot count, used slot count, total size of the stored values
+#     slots:  key digest, value size, stored at, accessed at
+#
+# The values themselves are stored in one file per key under data/, named after the key digest, and are replaced
+# atomically. Writers hold an exclusive flock on the lock file, readers a shared one.
+
+MAGIC = b'RCCACHE1'
+
+_HEADER = struct.Struct('<8sIIQ')
+_SLOT = struct.Struct('<16sQdd')
+
+_EMPTY = bytes(16)
+
+
+class DiskCache:
+    """
+        Persistent cache of raw response bodies which survives restarts and can be shared between the processes of a
+        host. The least recently accessed values are evicted once the total size exceeds `max_size`.
+        Reads update the access time of a value under the shared lock, so the eviction order is only approximately
+        LRU when several processes read the same values concurrently.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 max_size: int = 256 * 1024 * 1024,
+                 max_age: t.Optional[float] = None,
+                 slots: int = 4096) -> None:
+        """
+        :param directory: where the cache is stored. It is created if it does not exist
+        :param max_size: the maximum total size in bytes of the stored values
+        :param max_age: how many seconds a value is valid after it was stored. If None values never expire
+        :param slots: the size of the index. Up to 3/4 of the slots are used, in order to keep the lookups short.
+                      Ignored if the index already exists
+        """
+        self._directory = directory
+        self._data_directory = os.path.join(directory, 'data')
+        self._max_size = max_size
+        self._max_age = max_age
+        self._thread_lock = threading.RLock()
+
+        os.makedirs(self._data_directory, exist_ok=True)
+
+        self._lock_file = open(os.path.join(directory, 'lock'), 'a+b')
+        with self._lock(exclusive=True):
+            self._index = self._open_index(os.path.join(directory, 'index'), slots)
+            _, self._slots, _, _ = _HEADER.unpack_from(self._index, 0)
+
+            # recount the used slots in case the index was written by a version which did not keep count of them
+            self._set_count(sum(1 for position in range(self._slots) if self._read_digest(position) != _EMPTY))
+
+    def get(self, key: str) -> t.Optional[bytes]:
+        """
+        :param key:
+        :return: the stored value or None if it is missing or expired
+        """
+        digest = self._digest(key)
+
+        with self._lock(exclusive=False):
+            position = self._find(digest)
+            if position is None:
+                return None
+
+            _, size, stored_at, _ = _SLOT.unpack_from(self._index, self._offset(position))
+            now = time.time()
+            if self._max_age is not None and now - stored_at > self._max_age:
+                return None
+
+            try:
+                with open(self._path(digest), 'rb') as f:
+                    value = f.read()
+            except FileNotFoundError:
+                return None
+
+            # a benign race between readers which only affects the eviction order
+            struct.pack_into('<d', self._index, self._offset(position) + 32, now)
+
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Stores the value, evicting the least recently accessed values if needed
+
+        :param key:
+        :param value:
+        """
+        if len(value) > self._max_size:
+            return
+
+        digest = self._digest(key)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self._data_directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+
+            with self._lock(exclusive=True):
+                position = self._find(digest)
+                if position is not None:
+                    self._delete(position)
+
+                self._evict(len(value))
+
+                os.replace(tmp_path, self._path(digest))
+
+                now = time.time()
+                position = self._find_free(digest)
+                _SLOT.pack_into(self._index, self._offset(position), digest, len(value), now, now)
+                self._set_count(self._count() + 1)
+                self._add_to_total_size(len(value))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def delete(self, key: str) -> None:
+        with self._lock(exclusive=True):
+            position = self._find(self._digest(key))
+            if position is not None:
+                self._delete(position)
+
+    def clear(self) -> None:
+        with self._lock(exclusive=True):
+            for position in range(self._slots):
+                if self._read_digest(position) != _EMPTY:
+                    self._remove_file(self._read_digest(position))
+
+            self._index[_HEADER.size:] = bytes(self._slots * _SLOT.size)
+            self._set_count(0)
+            self._set_total_size(0)
+
+    @property
+    def size(self) -> int:
+        """The total size in bytes of the stored values"""
+        return _HEADER.unpack_from(self._index, 0)[3]
+
+    def __len__(self) -> int:
+        return self._count()
+
+    def close(self) -> None:
+        self._index.close()
+        self._lock_file.close()
+
+    @contextmanager
+    def _lock(self, exclusive: bool) -> t.Iterator[None]:
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _open_index(path: str, slots: int) -> mmap.mmap:
+        with open(path, 'a+b') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                f.write(_HEADER.pack(MAGIC, slots, 0, 0) + bytes(slots * _SLOT.size))
+                f.flush()
+
+            index = mmap.mmap(f.fileno(), 0)
+
+        if index[:len(MAGIC)] != MAGIC:
+            index.close()
+            raise ValueError(f"{path} is not a cache index")
+
+        return index
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+
+    def _path(self, digest: bytes) -> str:
+        return os.path.join(self._data_directory, digest.hex())
+
+    @staticmethod
+    def _offset(position: int) -> int:
+        return _HEADER.size + position * _SLOT.size
+
+    def _home(self, digest: bytes) -> int:
+        return int.from_bytes(digest[:8], 'little') % self._slots
+
+    def _read_digest(self, position: int) -> bytes:
+        offset = self._offset(position)
+        return self._index[offset:offset + 16]
+
+    def _find(self, digest: bytes) -> t.Optional[int]:
+        position = self._home(digest)
+        for _ in range(self._slots):
+            slot_digest = self._read_digest(position)
+            if slot_digest == digest:
+                return position
+            if slot_digest == _EMPTY:
+                return None
+            position = (position + 1) % self._slots
+
+        return None
+
+    def _find_free(self, digest: bytes) -> int:
+        position = self._home(digest)
+        while self._read_digest(position) != _EMPTY:
+            position = (position + 1) % self._slots
+
+        return position
+
+    def _evict(self, incoming_size: int) -> None:
+        """
+        Deletes the least recently accessed values until the incoming value fits both in size and in slots
+        """
+        max_count = self._slots * 3 // 4
+
+        if self.size + incoming_size <= self._max_size and self._count() < max_count:
+            return
+
+        slots = [_SLOT.unpack_from(self._index, self._offset(position)) for position in range(self._slots)]
+        used = sorted((accessed_at, digest) for digest, _, _, accessed_at in slots if digest != _EMPTY)
+
+        count = len(used)
+        for _, digest in used:
+            if self.size + incoming_size <= self._max_size and count < max_count:
+                break
+
+            self._delete(self._find(digest))
+            count -= 1
+
+    def _delete(self, position: int) -> None:
+        """
+        Deletes the value at the given position and shifts back the following entries of the probe sequence
+        """
+        digest, size, _, _ = _SLOT.unpack_from(self._index, self._offset(position))
+        self._remove_file(digest)
+        self._set_count(self._count() - 1)
+        self._add_to_total_size(-size)
+
+        while True:
+            self._index[self._offset(position):self._offset(position) + _SLOT.size] = bytes(_SLOT.size)
+
+            current = position
+            while True:
+                current = (current + 1) % self._slots
+                current_digest = self._read_digest(current)
+                if current_digest == _EMPTY:
+                    return
+
+                home = self._home(current_digest)
+                # the entry can move to the freed position only if its home is not cyclically within (position, current]
+                if (current > position and (home <= position or home > current)) or \
+                        (current < position and position >= home > current):
+                    break
+
+            self._index[self._offset(position):self._offset(position) + _SLOT.size] = \
+                self._index[self._offset(current):self._offset(current) + _SLOT.size]
+            position = current
+
+    def _remove_file(self, digest: bytes) -> None:
+        try:
+            os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _add_to_total_size(self, size: int) -> None:
+        self._set_total_size(self.size + size)
+
+    def _count(self) -> int:
+        return struct.unpack_from('<I', self._index, _HEADER.size - 12)[0]
+
+    def _set_count(self, count: int) -> None:
+        struct.pack_into('<I', self._index, _HEADER.size - 12, count)
+
+    def _set_total_size(self, size: int) -> None:
+        struct.pack_into('<Q', self._index, _HEADER.size - 8, size)
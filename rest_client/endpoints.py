@@ -0,0 +1,166 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import typing as t
+from string import Formatter
+from urllib.parse import quote
+
+from rest_client.columnar import ColumnSchema
+from rest_client.models import BaseModel
+from rest_client.requestor import Requestor
+from rest_client.typing import RequestParams
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+# the keyword arguments of a call of an endpoint which therefore cannot be used as path parameters
+_CALL_KEYWORDS = frozenset(('extra_params', 'json', 'priority', 'cached'))
+
+
+class Endpoint:
+    """
+        Declarative definition of an endpoint of a REST API, to be used as a class attribute of a REST client that
+        inherits from Requestor:
+
+            class MyClient(Requestor, ClientFactory):
+                get_user = Endpoint('GET', 'users/{user_id}', response_class=User)
+                get_users = Endpoint('GET', 'users', response_class=User, many=True)
+
+            client.get_user(user_id=1)
+
+        The method and the path template are validated and compiled once upon definition and the endpoint is bound
+        once per client instance, so that a call only has to fill in the (url encoded) path parameters.
+    """
+
+    def __init__(self,
+                 method: str,
+                 path: str,
+                 response_class: t.Optional[t.Type[BaseModel]] = None,
+                 many: bool = False,
+                 columns: t.Optional[ColumnSchema] = None) -> None:
+        """
+        :param method: one of GET, POST, PUT, DELETE
+        :param path: the URI of the endpoint, optionally with path parameters in braces i.e. 'users/{user_id}'
+        :param response_class: the Python class to be used for deserialization of the Response data
+        :param many: indicates whether the response is a list of objects or not
+        :param columns: if provided, the response list is decoded into column arrays according to this schema
+        """
+        if method not in Requestor._REQUEST_METHODS:
+            raise NotImplementedError(f"Method {method} is not implemented")
+
+        path_params = tuple(field for _, field, _, _ in Formatter().parse(path) if field)
+        reserved = _CALL_KEYWORDS.intersection(path_params)
+        if reserved:
+            raise ValueError(f"Reserved name(s) used as path parameters in '{path}': {', '.join(sorted(reserved))}")
+
+        self.method: str = method
+        self.path: str = path
+        self.response_class: t.Optional[t.Type[BaseModel]] = response_class
+        self.many: bool = many
+        self.columns: t.Optional[ColumnSchema] = columns
+        self.path_params: t.Tuple[str, ...] = path_params
+
+        self._path_param_names: t.FrozenSet[str] = frozenset(path_params)
+        self._name: t.Optional[str] = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    def __get__(self, instance: t.Optional[Requestor], owner: type) -> t.Union['Endpoint', '_BoundEndpoint']:
+        if instance is None:
+            return self
+
+        bound_endpoint = _BoundEndpoint(self, instance)
+
+        # cache the bound endpoint on the instance so that subsequent lookups bypass the descriptor
+        if self._name is not None:
+            instance.__dict__[self._name] = bound_endpoint
+
+        return bound_endpoint
+
+    def url(self, **path_params: t.Any) -> str:
+        """
+        Builds the URI of the endpoint by filling in the url encoded path parameters
+
+        :param path_params: the values of the path parameters of the template
+        :return: str
+        :raises TypeError: if a path parameter is missing or unexpected
+        """
+        if path_params.keys() != self._path_param_names:
+            missing = ', '.join(name for name in self.path_params if name not in path_params)
+            if missing:
+                raise TypeError(f"Missing path parameter(s) for '{self.path}': {missing}")
+
+            unexpected = ', '.join(name for name in path_params if name not in self._path_param_names)
+            raise TypeError(f"Unexpected path parameter(s) for '{self.path}': {unexpected}")
+
+        if not self.path_params:
+            return self.path
+
+        return self.path.format_map({name: quote(str(value), safe='') for name, value in path_params.items()})
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.method!r}, {self.path!r})"
+
+
+class _BoundEndpoint:
+    """An Endpoint bound to a Requestor instance"""
+
+    __slots__ = ('_endpoint', '_requestor')
+
+    def __init__(self, endpoint: Endpoint, requestor: Requestor) -> None:
+        self._endpoint = endpoint
+        self._requestor = requestor
+
+    def __call__(self,
+                 extra_params: t.Optional[RequestParams] = None,
+                 json: t.Optional[RequestParams] = None,
+                 priority: t.Optional[str] = None,
+                 cached: bool = False,
+                 **path_params: t.Any) -> t.Union[t.Any, t.List[t.Any]]:
+        """
+        :param extra_params: dict, list of tuples or bytes to send in the query string for the Request
+        :param json: A JSON serializable Python object to send in the body of the Request
+        :param priority: the priority class of the request, see rest_client.priority.PriorityDispatcher
+        :param cached: whether a GET request may be served from the cache of the client, see Requestor
+        :param path_params: the values of the path parameters of the endpoint
+        :return: response_class or list of response class or dict or list of dict
+        :raises: APIError
+        """
+        endpoint = self._endpoint
+
+        return self._requestor.perform_request(endpoint.method,
+                                               endpoint.url(**path_params),
+                                               extra_params=extra_params,
+                                               json=json,
+                                               many=endpoint.many,
+                                               response_class=endpoint.response_class,
+                                               priority=priority,
+                                               cached=cached,
+                                               columns=endpoint.columns)
@@ -27,6 +27,7 @@ http://opensource.org/licenses/BSD-3-Clause
 
 Details on EUROCONTROL: http://www.eurocontrol.int
 """
+import time
 import typing as t
 
 from rest_client.typing import Response
@@ -35,26 +36,141 @@ __author__ = "EUROCONTROL (SWIM)"
 
 
 class APIError(Exception):
+    """
+        Base class of the errors raised upon a failed Request. If created from a Response, its detail is parsed only
+        when accessed and only up to MAX_DETAIL_SIZE bytes of the body.
+    """
 
-    def __init__(self, detail: str, status_code: int) -> None:
-        self.detail: str = detail
-        self.status_code: int = status_code
+    # error bodies larger than that are not JSON decoded and are truncated in the detail
+    MAX_DETAIL_SIZE = 4096
+
+    def __init__(self,
+                 detail: t.Optional[str] = None,
+                 status_code: t.Optional[int] = None,
+                 response: t.Optional[t.Type[Response]] = None) -> None:
+        self._detail: t.Optional[str] = detail
+        self.status_code: t.Optional[int] = status_code
+        self.response: t.Optional[t.Type[Response]] = response
+
+    @property
+    def detail(self) -> t.Optional[str]:
+        if self._detail is None and self.response is not None:
+            self._detail = self._parse_detail(self.response)
+
+        return self._detail
+
+    @property
+    def retry_after(self) -> t.Optional[float]:
+        """
+        :return: how many seconds to wait before retrying as per the Retry-After header of the response, if any
+        """
+        headers = getattr(self.response, 'headers', None)
+        value = headers.get('Retry-After') if headers is not None else None
+        if not isinstance(value, str):
+            return None
+
+        try:
+            return max(0., float(value))
+        except ValueError:
+            pass
+
+        from email.utils import parsedate_to_datetime
+
+        try:
+            return max(0., parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
 
     @classmethod
     def from_response(cls, response: t.Type[Response]):
         """
-        Creates an APIError instance with error data extracted from the response
+        Creates an instance of the APIError subclass matching the status code of the response
+
         :param response:
         :return: APIError
         """
-        detail = response.text
-        if hasattr(response, 'json'):
+        status_code = response.status_code
+
+        error_class = _ERRORS_BY_STATUS_CODE.get(status_code)
+        if error_class is None:
+            if 400 <= status_code < 500:
+                error_class = ClientError
+            elif 500 <= status_code < 600:
+                error_class = ServerError
+            else:
+                error_class = cls
+
+        if not issubclass(error_class, cls):
+            error_class = cls
+
+        return error_class(status_code=status_code, response=response)
+
+    @classmethod
+    def _parse_detail(cls, response: t.Type[Response]) -> str:
+        content = response.content
+        if isinstance(content, (bytes, bytearray)) and len(content) > cls.MAX_DETAIL_SIZE:
+            return content[:cls.MAX_DETAIL_SIZE].decode('utf-8', errors='replace') + '...'
+
+        try:
             response_json = response.json()
-            if isinstance(response_json, dict) and hasattr(response_json, 'detail'):
-                detail = response_json.get('detail')
+        except ValueError:
+            response_json = None
+
+        if isinstance(response_json, dict) and 'detail' in response_json:
+            return response_json['detail']
 
-        return cls(detail=detail, status_code=response.status_code)
+        return response.text
 
     def __str__(self):
         return f"[{self.status_code}] - {self.detail}"
 
+
+class ClientError(APIError):
+    """4xx"""
+
+
+class NotFoundError(ClientError):
+    """404"""
+
+
+class ConflictError(ClientError):
+    """409"""
+
+
+class TooManyRequestsError(ClientError):
+    """429"""
+
+
+class ServerError(APIError):
+    """5xx"""
+
+
+class APIConnectionError(APIError):
+
+    def __init__(self, detail: str = "Connection error") -> None:
+        super().__init__(detail=detail)
+
+
+class APITimeoutError(APIError):
+
+    def __init__(self, detail: str = "Request timed out") -> None:
+        super().__init__(detail=detail)
+
+
+class DeadlineExceeded(APITimeoutError):
+
+    def __init__(self, detail: str = "Deadline exceeded") -> None:
+        super().__init__(detail=detail)
+
+
+class ConcurrencyLimitExceeded(APIError):
+
+    def __init__(self, detail: str = "Concurrency limit exceeded") -> None:
+        super().__init__(detail=detail)
+
+
+_ERRORS_BY_STATUS_CODE: t.Dict[int, t.Type[APIError]] = {
+    404: NotFoundError,
+    409: ConflictError,
+    429: TooManyRequestsError,
+}
@@ -0,0 +1,154 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import threading
+import time
+import typing as t
+
+from rest_client import deadlines
+from rest_client.errors import ConcurrencyLimitExceeded
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+class AdaptiveLimiter:
+    """
+        Limits the amount of in-flight requests towards a host and adapts that limit to the observed behaviour of the
+        host (AIMD): the limit grows additively (by one per `limit` successful calls) while calls succeed within the
+        latency threshold with the limit saturated, and shrinks multiplicatively upon errors, overload responses (429,
+        5xx) or slow calls. Calls completing while the limit is not reached do not grow it since they do not prove
+        that the host can sustain a higher one. The limit shrinks once per congestion event: failures of calls which
+        started before the latest decrease are ignored since they were caused by the same overload.
+        Callers that exceed the limit are queued for at most `max_wait` seconds.
+    """
+
+    def __init__(self,
+                 initial_limit: int = 10,
+                 min_limit: int = 1,
+                 max_limit: int = 200,
+                 latency_threshold: float = 1.0,
+                 backoff_ratio: float = 0.9,
+                 max_wait: t.Optional[float] = None) -> None:
+        """
+        :param initial_limit: the amount of in-flight requests allowed initially
+        :param min_limit: the lowest the limit can drop to
+        :param max_limit: the highest the limit can grow to
+        :param latency_threshold: how many seconds a call may take before it is considered a sign of overload
+        :param backoff_ratio: the factor the limit is multiplied with upon overload
+        :param max_wait: how many seconds a caller may be queued before giving up. If None it may wait forever, bound
+                         however by the deadline of the current context if any
+        """
+        self._limit: float = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._latency_threshold = latency_threshold
+        self._backoff_ratio = backoff_ratio
+        self._max_wait = max_wait
+
+        self._in_flight: int = 0
+        self._queued: int = 0
+        self._last_decrease: float = float('-inf')
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """The current amount of in-flight requests allowed"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def metrics(self) -> t.Dict[str, int]:
+        """
+        :return: a snapshot of the current limit, the in-flight and the queued requests
+        """
+        with self._condition:
+            return {'limit': self.limit, 'in_flight': self._in_flight, 'queued': self._queued}
+
+    def acquire(self) -> None:
+        """
+        Blocks until a request may be performed
+
+        :raises: ConcurrencyLimitExceeded if no slot was freed within `max_wait` or the deadline of the current context
+        """
+        timeout = self._max_wait
+        seconds = deadlines.remaining()
+        if seconds is not None:
+            timeout = seconds if timeout is None else min(timeout, seconds)
+
+        with self._condition:
+            if self._in_flight >= self.limit:
+                self._queued += 1
+                try:
+                    acquired = self._condition.wait_for(lambda: self._in_flight < self.limit, timeout=timeout)
+                finally:
+                    self._queued -= 1
+
+                if not acquired:
+                    raise ConcurrencyLimitExceeded()
+
+            self._in_flight += 1
+
+    def release(self, latency: float, success: bool) -> None:
+        """
+        Frees the slot of a completed request and adapts the limit
+
+        :param latency: how many seconds the request took since it acquired its slot
+        :param success: whether the request succeeded or failed due to an error or overload of the host
+        """
+        with self._condition:
+            saturated = self._in_flight >= self.limit or self._queued > 0
+            self._in_flight -= 1
+
+            if success and latency <= self._latency_threshold:
+                if saturated:
+                    self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+            else:
+                now = time.monotonic()
+                if now - latency >= self._last_decrease:
+                    self._limit = max(self._min_limit, self._limit * self._backoff_ratio)
+                    self._last_decrease = now
+
+            self._condition.notify(max(0, self.limit - self._in_flight))
+
+    def cancel(self) -> None:
+        """
+        Frees the slot of a request which was not performed, without adapting the limit
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    def __repr__(self) -> str:
+        return f"AdaptiveLimiter(limit={self.limit}, in_flight={self._in_flight}, queued={self._queued})"
@@ -0,0 +1,271 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import argparse
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+import typing as t
+from collections import Counter
+
+from rest_client.client_factory import ClientFactory
+from rest_client.errors import APIError
+from rest_client.requestor import Requestor
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+# A scenario file is a JSON object such as:
+#
+#     {
+#         "host": "localhost:8080",
+#         "https": false,
+#         "timeout": 10,
+#         "calls": [
+#             {"method": "GET", "path": "users", "params": {"active": true}, "weight": 3},
+#             {"method": "POST", "path": "users", "json": {"name": "name"}, "weight": 1}
+#         ]
+#     }
+#
+# where every call is picked randomly in proportion to its weight and "timeout" defaults to DEFAULT_TIMEOUT seconds.
+
+PERCENTILES = (50, 90, 95, 99)
+
+DEFAULT_TIMEOUT = 30
+
+
+class LoadClient(Requestor, ClientFactory):
+    pass
+
+
+def percentile(sorted_values: t.Sequence[float], p: float) -> float:
+    """
+    :param sorted_values: values sorted in ascending order
+    :param p: the percentile, between 0 and 100
+    :return: the nearest-rank percentile of the values
+    """
+    if not sorted_values:
+        return 0.
+
+    rank = max(1, -(-len(sorted_values) * p // 100))
+
+    return sorted_values[int(rank) - 1]
+
+
+class LoadGenerator:
+    """
+        Performs the weighted calls of a scenario via a client built by ClientFactory.create, from `concurrency`
+        threads and optionally paced at `rps` requests per second, for `duration` seconds or `requests` requests.
+        When paced, the latency of a call is measured from the time it was scheduled rather than actually sent so that
+        the queueing of an overloaded target is not hidden (coordinated omission).
+    """
+
+    def __init__(self,
+                 scenario: t.Dict[str, t.Any],
+                 concurrency: int = 10,
+                 rps: t.Optional[float] = None,
+                 duration: t.Optional[float] = None,
+                 requests: t.Optional[int] = None,
+                 http2: bool = False) -> None:
+        """
+        :param scenario: the parsed scenario file
+        :param concurrency: the amount of threads performing calls
+        :param rps: the target rate of requests per second. If None every thread calls as fast as possible
+        :param duration: for how many seconds to generate load
+        :param requests: how many requests to perform overall
+        :param http2: whether to multiplex the requests over HTTP/2
+        """
+        if duration is None and requests is None:
+            raise ValueError("Either duration or requests should be provided")
+
+        self._calls = scenario['calls']
+        self._cumulative_weights = list(itertools.accumulate(call.get('weight', 1) for call in self._calls))
+        self._concurrency = concurrency
+        self._rps = rps
+        self._duration = duration
+        self._requests = requests
+
+        self._client = LoadClient.create(host=scenario['host'],
+                                         https=scenario.get('https', True),
+                                         timeout=scenario.get('timeout', DEFAULT_TIMEOUT),
+                                         verify=scenario.get('verify', True),
+                                         http2=http2)
+
+        self._latencies: t.List[float] = []
+        self._errors: t.Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def run(self) -> t.Dict[str, t.Any]:
+        """
+        :return: the report of the run
+        """
+        counter = itertools.count()
+        started = time.perf_counter()
+        ends_at = started + self._duration if self._duration is not None else None
+
+        def worker():
+            rng = random.Random()
+            for i in counter:
+                if self._requests is not None and i >= self._requests:
+                    return
+
+                scheduled = None
+                if self._rps:
+                    scheduled = started + i / self._rps
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+
+                if ends_at is not None and time.perf_counter() >= ends_at:
+                    return
+
+                self._call(rng.choices(self._calls, cum_weights=self._cumulative_weights)[0], scheduled)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self._concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return self._report(time.perf_counter() - started)
+
+    def _call(self, call: t.Dict[str, t.Any], scheduled: t.Optional[float] = None) -> None:
+        """
+        :param call: the call of the scenario to perform
+        :param scheduled: when the call was scheduled to be sent, if paced
+        """
+        error = None
+        started = scheduled if scheduled is not None else time.perf_counter()
+        try:
+            self._client.perform_request(call.get('method', 'GET'),
+                                         call['path'],
+                                         extra_params=call.get('params'),
+                                         json=call.get('json'))
+        except APIError as e:
+            error = str(e.status_code) if e.status_code is not None else type(e).__name__
+        except Exception as e:
+            error = type(e).__name__
+        latency = time.perf_counter() - started
+
+        with self._lock:
+            self._latencies.append(latency)
+            if error is not None:
+                self._errors[error] += 1
+
+    def _report(self, elapsed: float) -> t.Dict[str, t.Any]:
+        latencies = sorted(self._latencies)
+
+        report = {
+            'requests': len(latencies),
+            'errors': sum(self._errors.values()),
+            'duration_s': round(elapsed, 3),
+            'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.,
+            'latency_ms': {
+                **{f'p{p}': round(percentile(latencies, p) * 1000, 2) for p in PERCENTILES},
+                'max': round(latencies[-1] * 1000, 2) if latencies else 0.,
+            },
+            'errors_by_status': dict(self._errors.most_common()),
+            'connections': self._connection_stats(),
+        }
+
+        return report
+
+    def _connection_stats(self) -> t.Optional[t.Dict[str, t.Any]]:
+        """
+        :return: how many connections were opened for how many requests, as tracked by the urllib3 pools of a
+                 requests.Session, or None for other transports
+        """
+        adapters = getattr(self._client._request_handler.session, 'adapters', None)
+        if not adapters:
+            return None
+
+        opened = served = 0
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                opened += pool.num_connections
+                served += pool.num_requests
+
+        return {
+            'opened': opened,
+            'requests': served,
+            'reuse_ratio': round(1 - opened / served, 3) if served else 0.,
+        }
+
+
+def format_report(report: t.Dict[str, t.Any]) -> str:
+    lines = [
+        f"requests:    {report['requests']} in {report['duration_s']}s ({report['throughput_rps']} req/s)",
+        "latency (ms): " + ', '.join(f"{name}={value}" for name, value in report['latency_ms'].items()),
+        f"errors:      {report['errors']}",
+    ]
+    lines.extend(f"  {status}: {count}" for status, count in report['errors_by_status'].items())
+
+    connections = report['connections']
+    if connections is not None:
+        lines.append(f"connections: {connections['opened']} opened for {connections['requests']} requests "
+                     f"(reuse ratio {connections['reuse_ratio']})")
+
+    return '\n'.join(lines)
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog='rest-client-loadgen',
+                                     description="Generates load against a REST API based on a scenario file")
+    parser.add_argument('scenario', help="path of the JSON scenario file")
+    parser.add_argument('-c', '--concurrency', type=int, default=10, help="amount of threads performing calls")
+    parser.add_argument('-r', '--rps', type=float, help="target rate of requests per second")
+    parser.add_argument('-d', '--duration', type=float, help="for how many seconds to generate load")
+    parser.add_argument('-n', '--requests', type=int, help="how many requests to perform overall")
+    parser.add_argument('--http2', action='store_true', help="multiplex the requests over HTTP/2")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.duration is None and args.requests is None:
+        parser.error("one of --duration or --requests is required")
+
+    with open(args.scenario) as f:
+        scenario = json.load(f)
+
+    report = LoadGenerator(scenario,
+                           concurrency=args.concurrency,
+                           rps=args.rps,
+                           duration=args.duration,
+                           requests=args.requests,
+                           http2=args.http2).run()
+
+    sys.stdout.write((json.dumps(report, indent=2) if args.json else format_report(report)) + '\n')
+
+
+if __name__ == '__main__':
+    main()
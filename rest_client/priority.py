@@ -0,0 +1,189 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import threading
+import time
+import typing as t
+from collections import deque
+from contextlib import contextmanager
+
+from rest_client import deadlines
+from rest_client.errors import ConcurrencyLimitExceeded
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+class _LaneStats:
+
+    __slots__ = ('requests', 'wait_time_total', 'wait_time_max')
+
+    def __init__(self) -> None:
+        self.requests: int = 0
+        self.wait_time_total: float = 0.
+        self.wait_time_max: float = 0.
+
+    def add(self, wait_time: float) -> None:
+        self.requests += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+
+
+class PriorityDispatcher:
+    """
+        Shares a fixed amount of request slots among priority classes (lanes) via weighted fair queuing: whenever a
+        slot is freed it is handed to the next queued caller of the lane with the least service relative to its
+        weight, so that under contention each lane gets a share of the slots proportional to its weight and bursts
+        of a low priority lane cannot starve the others.
+    """
+
+    DEFAULT_WEIGHTS = {'interactive': 8, 'batch': 1}
+
+    def __init__(self,
+                 weights: t.Optional[t.Dict[str, int]] = None,
+                 max_concurrency: int = 10,
+                 default_priority: t.Optional[str] = None,
+                 max_wait: t.Optional[float] = None) -> None:
+        """
+        :param weights: the relative share of the slots per priority class
+        :param max_concurrency: the amount of requests that may be in flight at the same time
+        :param default_priority: the priority class of the requests without one. Defaults to the first class
+        :param max_wait: how many seconds a caller may be queued before giving up. If None it may wait forever, bound
+                         however by the deadline of the current context if any
+        """
+        self._weights: t.Dict[str, int] = dict(weights or self.DEFAULT_WEIGHTS)
+        self._max_concurrency = max_concurrency
+        self._default_priority: str = default_priority or next(iter(self._weights))
+        self._max_wait = max_wait
+
+        if self._default_priority not in self._weights:
+            raise ValueError(f"Unknown priority: {self._default_priority}")
+
+        self._queues: t.Dict[str, t.Deque[threading.Event]] = {lane: deque() for lane in self._weights}
+        self._passes: t.Dict[str, float] = {lane: 0. for lane in self._weights}
+        self._stats: t.Dict[str, _LaneStats] = {lane: _LaneStats() for lane in self._weights}
+        self._virtual_time: float = 0.
+        self._in_flight: int = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def metrics(self) -> t.Dict[str, t.Dict[str, t.Union[int, float]]]:
+        """
+        :return: per priority class, the current queue depth, the amount of dispatched requests and their total and
+                 maximum time spent in the queue in seconds
+        """
+        with self._lock:
+            return {
+                lane: {
+                    'queued': len(self._queues[lane]),
+                    'requests': stats.requests,
+                    'wait_time_total': stats.wait_time_total,
+                    'wait_time_max': stats.wait_time_max,
+                }
+                for lane, stats in self._stats.items()
+            }
+
+    @contextmanager
+    def slot(self, priority: t.Optional[str] = None) -> t.Iterator[None]:
+        """
+        Holds a request slot for the duration of the block
+
+        :param priority: the priority class of the request
+        :raises: ConcurrencyLimitExceeded if no slot was granted within `max_wait` or the deadline of the context
+        """
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def acquire(self, priority: t.Optional[str] = None) -> None:
+        """
+        Blocks until a request slot is granted to the given priority class
+
+        :param priority: the priority class of the request
+        :raises: ConcurrencyLimitExceeded if no slot was granted within `max_wait` or the deadline of the context
+        """
+        lane = priority or self._default_priority
+        if lane not in self._weights:
+            raise ValueError(f"Unknown priority: {lane}")
+
+        started = time.monotonic()
+
+        with self._lock:
+            if self._in_flight < self._max_concurrency and not any(self._queues.values()):
+                self._in_flight += 1
+                self._dispatch(lane)
+                self._stats[lane].add(0.)
+                return
+
+            queue = self._queues[lane]
+            if not queue:
+                # a lane that was idle does not get credit for the time it did not use its share
+                self._passes[lane] = max(self._passes[lane], self._virtual_time)
+
+            waiter = threading.Event()
+            queue.append(waiter)
+
+        if not waiter.wait(timeout=self._get_wait_timeout()):
+            with self._lock:
+                if not waiter.is_set():
+                    queue.remove(waiter)
+                    raise ConcurrencyLimitExceeded(f"No request slot was granted to priority '{lane}'")
+
+        with self._lock:
+            self._stats[lane].add(time.monotonic() - started)
+
+    def release(self) -> None:
+        """
+        Frees a request slot by handing it over to the next queued caller, if any
+        """
+        with self._lock:
+            lanes = [lane for lane, queue in self._queues.items() if queue]
+            if not lanes:
+                self._in_flight -= 1
+                return
+
+            lane = min(lanes, key=self._passes.__getitem__)
+            self._dispatch(lane)
+            self._queues[lane].popleft().set()
+
+    def _dispatch(self, lane: str) -> None:
+        self._virtual_time = max(self._virtual_time, self._passes[lane])
+        self._passes[lane] = self._virtual_time + 1 / self._weights[lane]
+
+    def _get_wait_timeout(self) -> t.Optional[float]:
+        timeout = self._max_wait
+        seconds = deadlines.remaining()
+        if seconds is not None:
+            timeout = seconds if timeout is None else min(timeout, seconds)
+
+        return timeout
@@ -0,0 +1,191 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import logging
+import random
+import time
+import typing as t
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from rest_client.typing import Response
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+_logger = logging.getLogger(__name__)
+
+# the profile of the call being performed in the current context, so that the request handler can mark its phases
+_current_profile: ContextVar[t.Optional['CallProfile']] = ContextVar('rest_client_profile', default=None)
+
+
+class CallProfile:
+    """
+        The timing, status code and payload sizes of a single call. Sampled calls also record the duration of each
+        phase:
+
+        - queue_wait: waiting for a request slot of a PriorityDispatcher and/or an AdaptiveLimiter, if any
+        - send_wait: from sending the request until the response headers were parsed (requests.Response.elapsed)
+        - receive: downloading the response body
+        - request: send_wait and receive together, for transports that do not report `elapsed`
+        - json_decode: decoding the response body
+        - from_json: deserializing the decoded data into the response class
+    """
+
+    __slots__ = ('method', 'path', 'sampled', 'status_code', 'phases', 'request_bytes', 'response_bytes',
+                 'duration', '_started', '_last')
+
+    def __init__(self, method: str, path: str, sampled: bool) -> None:
+        self.method: str = method
+        self.path: str = path
+        self.sampled: bool = sampled
+        self.status_code: t.Optional[int] = None
+        self.phases: t.Dict[str, float] = {}
+        self.request_bytes: t.Optional[int] = None
+        self.response_bytes: t.Optional[int] = None
+        self.duration: t.Optional[float] = None
+
+        self._started = self._last = time.perf_counter()
+
+    def response_received(self, response: t.Type[Response]) -> None:
+        """
+        Records the status code and the payload sizes of the received response and, if sampled, the request phases
+        """
+        if self.sampled:
+            now = time.perf_counter()
+            request_duration = now - self._last
+            self._last = now
+
+            elapsed = getattr(response, 'elapsed', None)
+            if isinstance(elapsed, timedelta):
+                send_wait = min(elapsed.total_seconds(), request_duration)
+                self.phases['send_wait'] = send_wait
+                self.phases['receive'] = request_duration - send_wait
+            else:
+                self.phases['request'] = request_duration
+
+        self.status_code = getattr(response, 'status_code', None)
+
+        content = getattr(response, 'content', None)
+        if isinstance(content, (bytes, bytearray)):
+            self.response_bytes = len(content)
+
+        body = getattr(getattr(response, 'request', None), 'body', None)
+        if isinstance(body, (bytes, str)):
+            self.request_bytes = len(body)
+
+    def mark(self, phase: str) -> None:
+        """
+        Records the duration of the given phase which ends now
+        """
+        if not self.sampled:
+            return
+
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
+
+    @contextmanager
+    def activate(self) -> t.Iterator[None]:
+        """
+        Makes this the profile of the current context for the duration of the block, see `mark_phase`
+        """
+        token = _current_profile.set(self)
+        try:
+            yield
+        finally:
+            _current_profile.reset(token)
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self._started
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            'method': self.method,
+            'path': self.path,
+            'status_code': self.status_code,
+            'duration_ms': round(self.duration * 1000, 3) if self.duration is not None else None,
+            'phases_ms': {phase: round(duration * 1000, 3) for phase, duration in self.phases.items()},
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+        }
+
+
+def mark_phase(phase: str) -> None:
+    """
+    Records the duration of the given phase, which ends now, in the profile of the current context if any
+    """
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.mark(phase)
+
+
+class Profiler:
+    """
+        Opt-in profiling of the calls of a Requestor. Every call is timed along with its status code and payload
+        sizes and a `sample_rate` fraction of them also records its phase breakdown. Calls slower than
+        `slow_threshold` are logged as warnings with the profile as structured data under the `rest_client_profile`
+        attribute of the log record. Requests performed with `cached=True` while a cache is configured are not
+        profiled.
+    """
+
+    def __init__(self,
+                 sample_rate: float = 0.01,
+                 slow_threshold: t.Optional[float] = 1.0,
+                 logger: t.Optional[logging.Logger] = None,
+                 max_records: int = 1000) -> None:
+        """
+        :param sample_rate: the fraction, between 0 and 1, of the calls whose phases are recorded
+        :param slow_threshold: how many seconds a call may take before it is logged. If None no call is logged
+        :param logger: the logger of the slow calls. Defaults to the `rest_client.profiling` logger
+        :param max_records: how many of the latest sampled profiles to keep in `records`
+        """
+        self._sample_rate = sample_rate
+        self._slow_threshold = slow_threshold
+        self._logger = logger or _logger
+
+        self.records: t.Deque[CallProfile] = deque(maxlen=max_records)
+
+    def start(self, method: str, path: str) -> CallProfile:
+        return CallProfile(method, path, sampled=random.random() < self._sample_rate)
+
+    def finish(self, profile: CallProfile) -> None:
+        profile.finish()
+
+        if profile.sampled:
+            self.records.append(profile)
+
+        if self._slow_threshold is not None and profile.duration > self._slow_threshold:
+            self._logger.warning("Slow call: %s %s took %.1f ms",
+                                 profile.method,
+                                 profile.path,
+                                 profile.duration * 1000,
+                                 extra={'rest_client_profile': profile.to_dict()})
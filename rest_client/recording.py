@@ -0,0 +1,281 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import itertools
+import json as _json
+import mmap
+import struct
+import threading
+import time
+import typing as t
+
+from requests.sessions import Session
+from requests.structures import CaseInsensitiveDict
+
+from rest_client.typing import Response
+
+__author__ = "EUROCONTROL (SWIM)"
+
+# Recordings are stored in a single append-only file of length-prefixed records:
+#
+#     MAGIC | (key length, meta length, body length, key, meta, body) * N
+#
+# where key identifies the request (method, URL, query params and body), meta is a JSON object holding the status code
+# and the headers of the response and body holds the raw response content. The lengths allow the replay side to index
+# the whole file in one pass without decoding the bodies.
+MAGIC = b'RCREC\x01'
+
+_RECORD_HEADER = struct.Struct('>III')
+
+
+class RecordingNotFound(LookupError):
+    pass
+
+
+def _canonical(value: t.Any) -> t.Any:
+    if isinstance(value, dict):
+        return sorted((str(k), _canonical(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, bytes):
+        return value.decode('latin-1')
+
+    return value
+
+
+def make_key(method: str, url: str, **kwargs: t.Any) -> bytes:
+    """
+    Builds the key that identifies a request upon recording and replaying
+
+    :param method: one of GET, POST, PUT, DELETE
+    :param url: the full URL of the Request
+    :param kwargs: the keyword arguments of the request, of which only params, data and json are taken into account
+    :return: bytes
+    """
+    key = [method, url, _canonical(kwargs.get('params')), _canonical(kwargs.get('data')), kwargs.get('json')]
+
+    return _json.dumps(key, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+class ReplayResponse:
+    """Lightweight replacement of requests.Response served by ReplaySession"""
+
+    __slots__ = ('status_code', 'headers', 'content', 'url')
+
+    def __init__(self, status_code: int, headers: CaseInsensitiveDict, content: bytes, url: str = '') -> None:
+        self.status_code: int = status_code
+        self.headers: CaseInsensitiveDict = headers
+        self.content: bytes = content
+        self.url: str = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self, **kwargs: t.Any) -> t.Any:
+        return _json.loads(self.content, **kwargs)
+
+
+class RecordingSession:
+    """
+        Session-like transport that performs the requests via a real session (requests.Session by default) and appends
+        every request/response pair to a recording file which can later be served by ReplaySession. To be plugged in
+        RequestHandler via its `request_handler_maker` hook.
+    """
+
+    def __init__(self, path: str, session: t.Optional[t.Any] = None) -> None:
+        """
+        :param path: the recording file. New records are appended if it already exists
+        :param session: the session that actually performs the requests. Defaults to requests.Session
+        """
+        self._session = session if session is not None else Session()
+        self._lock = threading.Lock()
+        self._file = open(path, 'ab')
+
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    @property
+    def auth(self):
+        return self._session.auth
+
+    @auth.setter
+    def auth(self, value):
+        self._session.auth = value
+
+    @property
+    def cert(self):
+        return self._session.cert
+
+    @cert.setter
+    def cert(self, value):
+        self._session.cert = value
+
+    @property
+    def verify(self):
+        return self._session.verify
+
+    @verify.setter
+    def verify(self, value):
+        self._session.verify = value
+
+    def mount(self, prefix: str, adapter: t.Any) -> None:
+        self._session.mount(prefix, adapter)
+
+    def get(self, url: str, **kwargs: t.Any) -> t.Type[Response]:
+        return self._record('GET', self._session.get, url, **kwargs)
+
+    def delete(self, url: str, **kwargs: t.Any) -> t.Type[Response]:
+        return self._record('DELETE', self._session.delete, url, **kwargs)
+
+    def post(self, url: str, **kwargs: t.Any) -> t.Type[Response]:
+        return self._record('POST', self._session.post, url, **kwargs)
+
+    def put(self, url: str, **kwargs: t.Any) -> t.Type[Response]:
+        return self._record('PUT', self._session.put, url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> 'RecordingSession':
+        return self
+
+    def __exit__(self, *args: t.Any) -> None:
+        self.close()
+
+    def _record(self, method: str, request_method: t.Callable, url: str, **kwargs: t.Any) -> t.Type[Response]:
+        response = request_method(url, **kwargs)
+
+        key = make_key(method, url, **kwargs)
+        meta = _json.dumps({'status': response.status_code, 'headers': dict(response.headers)}).encode('utf-8')
+        body = response.content or b''
+
+        with self._lock:
+            self._file.write(_RECORD_HEADER.pack(len(key), len(meta), len(body)) + key + meta + body)
+            self._file.flush()
+
+        return response
+
+
+class ReplaySession:
+    """
+        Session-like transport that serves the responses of a recording made by RecordingSession without any network
+        access. To be plugged in RequestHandler via its `request_handler_maker` hook. Requests that were recorded more
+        than once are served their recorded responses in turn.
+        The file is memory mapped and only the bodies of the served responses are read. A truncated last record, i.e.
+        after a crash or while a recorder is still appending to the file, is ignored.
+    """
+
+    def __init__(self, path: str, latency: float = 0.0) -> None:
+        """
+        :param path: the recording file
+        :param latency: how many seconds to wait before serving each response in order to simulate the network
+        """
+        self.auth: t.Optional[tuple] = None
+        self.cert: t.Optional[t.Union[str, t.Tuple[str, str]]] = None
+        self.verify: t.Union[bool, str] = True
+
+        self._latency = latency
+        self._lock = threading.Lock()
+        self._data = self._map(path)
+        self._index = {key: itertools.cycle(records) for key, records in self._load(self._data, path).items()}
+
+    def mount(self, prefix: str, adapter: t.Any) -> None:
+        pass
+
+    def get(self, url: str, **kwargs: t.Any) -> ReplayResponse:
+        return self._replay('GET', url, **kwargs)
+
+    def delete(self, url: str, **kwargs: t.Any) -> ReplayResponse:
+        return self._replay('DELETE', url, **kwargs)
+
+    def post(self, url: str, **kwargs: t.Any) -> ReplayResponse:
+        return self._replay('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs: t.Any) -> ReplayResponse:
+        return self._replay('PUT', url, **kwargs)
+
+    def close(self) -> None:
+        self._data.close()
+
+    def _replay(self, method: str, url: str, **kwargs: t.Any) -> ReplayResponse:
+        try:
+            records = self._index[make_key(method, url, **kwargs)]
+        except KeyError:
+            raise RecordingNotFound(f"No recorded response for {method} {url}") from None
+
+        with self._lock:
+            status_code, headers, body_offset, body_length = next(records)
+
+        content = self._data[body_offset:body_offset + body_length]
+
+        if self._latency > 0:
+            time.sleep(self._latency)
+
+        return ReplayResponse(status_code, headers, content, url)
+
+    @staticmethod
+    def _map(path: str) -> mmap.mmap:
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a recording file")
+
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _load(data: mmap.mmap, path: str) -> t.Dict[bytes, t.List[t.Tuple[int, CaseInsensitiveDict, int, int]]]:
+        """
+        Indexes the records of the recording by their key
+
+        :return: the status code, headers, body offset and body length of the recorded responses by key
+        :raises ValueError: if the metadata of a complete record cannot be decoded
+        """
+        index = {}
+        offset = len(MAGIC)
+        while offset + _RECORD_HEADER.size <= len(data):
+            key_length, meta_length, body_length = _RECORD_HEADER.unpack_from(data, offset)
+            offset += _RECORD_HEADER.size
+
+            if offset + key_length + meta_length + body_length > len(data):
+                break
+
+            key = data[offset:offset + key_length]
+            offset += key_length
+            try:
+                meta = _json.loads(data[offset:offset + meta_length])
+            except ValueError:
+                raise ValueError(f"{path} is corrupted at offset {offset}") from None
+            offset += meta_length
+
+            index.setdefault(key, []).append((meta['status'], CaseInsensitiveDict(meta['headers']), offset,
+                                              body_length))
+            offset += body_length
+
+        return index
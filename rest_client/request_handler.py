@@ -27,45 +27,161 @@ http://opensource.org/licenses/BSD-3-Clause
 
 Details on EUROCONTROL: http://www.eurocontrol.int
 """
+import time
 import typing as t
 
 import requests
 from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 from urllib3.util.retry import Retry
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.timeout import Timeout as Urllib3Timeout
+
+from rest_client import deadlines, profiling
+from rest_client.errors import DeadlineExceeded, APITimeoutError, APIConnectionError
+from rest_client.limiter import AdaptiveLimiter
+from rest_client.priority import PriorityDispatcher
 from rest_client.typing import RequestParams, Response
 
 __author__ = "EUROCONTROL (SWIM)"
 
+Timeout = t.Optional[t.Union[float, t.Tuple[t.Optional[float], t.Optional[float]]]]
+
+
+class _DeadlineRetry(Retry):
+    """
+        Retry that gives up as soon as the deadline of the current call has passed and never backs off, or sleeps as
+        per a Retry-After header, beyond it
+    """
+
+    def is_exhausted(self) -> bool:
+        seconds = deadlines.remaining()
+
+        return super().is_exhausted() or (seconds is not None and seconds <= 0)
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        seconds = deadlines.remaining()
+
+        return backoff if seconds is None else max(0, min(backoff, seconds))
+
+    def get_retry_after(self, response: t.Any) -> t.Optional[float]:
+        retry_after = super().get_retry_after(response)
+        seconds = deadlines.remaining()
+
+        if retry_after is None or seconds is None:
+            return retry_after
+
+        return max(0, min(retry_after, seconds))
+
+
+def _cap_timeout(timeout: Timeout, seconds: float) -> Timeout:
+    """
+    Caps a requests timeout, i.e. a number, a (connect, read) tuple or None, to the given amount of seconds
+    """
+    if isinstance(timeout, tuple):
+        return tuple(seconds if phase is None else min(phase, seconds) for phase in timeout)
+
+    return seconds if timeout is None else min(timeout, seconds)
+
+
+class _DeadlinePoolMixin:
+    """
+        Connection pool whose every attempt, i.e. every retry performed by urllib3, waits at most for the time left
+        until the deadline of the current call and forwards that time in the deadline header of the request
+    """
+
+    def urlopen(self, method: str, url: str, body: t.Any = None, headers: t.Any = None, *args: t.Any,
+                **kwargs: t.Any) -> t.Any:
+        seconds = deadlines.remaining()
+        if seconds is not None:
+            # urllib3 rejects zero timeouts; the attempt times out at once and the retry gives up
+            seconds = max(seconds, 0.001)
+
+            timeout = kwargs.get('timeout')
+            if isinstance(timeout, Urllib3Timeout):
+                connect, read = _cap_timeout((timeout.connect_timeout, timeout.read_timeout), seconds)
+                kwargs['timeout'] = Urllib3Timeout(connect=connect, read=read)
+
+            if headers is not None and RequestHandler.DEADLINE_HEADER in headers:
+                headers = headers.copy()
+                headers[RequestHandler.DEADLINE_HEADER] = str(int(seconds * 1000))
+
+        return super().urlopen(method, url, body, headers, *args, **kwargs)
+
+
+class _DeadlineHTTPConnectionPool(_DeadlinePoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _DeadlineHTTPSConnectionPool(_DeadlinePoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _DeadlineAdapter(HTTPAdapter):
+    """
+        HTTPAdapter whose retries are bound by the deadline of the current call: each attempt waits at most for the
+        time left until the deadline instead of the timeout of the first attempt
+    """
+
+    def init_poolmanager(self, *args: t.Any, **kwargs: t.Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _DeadlineHTTPConnectionPool,
+                                                   'https': _DeadlineHTTPSConnectionPool}
+
 
 class RequestHandler:
     """
         Wraps up the basic expected request methods of a REST client such as get, post, delete, put.
-        The default used handler is: requests.session
+        The default used handler is: requests.session. Any session-like transport, i.e.
+        rest_client.transports.HTTP2Session, can be plugged in via `request_handler_maker`.
     """
     _URL_BASE_FORMAT = "{scheme}://{host}/"
 
+    # the header via which the time left until the deadline of the call is forwarded to the server
+    DEADLINE_HEADER = 'X-Request-Timeout-Ms'
+
     def __init__(self,
                  host: str,
                  https: bool = True,
-                 timeout: int = 30,
+                 timeout: Timeout = 30,
                  auth: t.Optional[tuple] = None,
                  cert: t.Optional[t.Union[str, t.Tuple[str, str]]] = None,
                  verify: t.Optional[t.Union[bool, str]] = True,
                  retry: t.Optional[t.Union[int, None]] = None,
-                 request_handler_maker: t.Optional[t.Callable] = None) -> None:
+                 request_handler_maker: t.Optional[t.Callable] = None,
+                 connect_timeout: t.Optional[float] = None,
+                 read_timeout: t.Optional[float] = None,
+                 deadline: t.Optional[float] = None,
+                 limiter: t.Optional[AdaptiveLimiter] = None,
+                 dispatcher: t.Optional[PriorityDispatcher] = None) -> None:
         """
         :param host: The host of the service to be accessed via the client
         :param https: indicates whether the host serves over TSL or not
         :param auth: pair of username and password
         :param cert: SSL client certificate
         :param verify: SSL Verification
-        :param timeout: How many seconds to wait for the server to send data before giving up
+        :param timeout: How many seconds to wait for the server to send data before giving up. Can also be a
+                        (connect, read) tuple
         :param retry: how many times it will retry the request in case of connection error
         :param request_handler_maker: a callback which instantiates a custom request handler
+        :param connect_timeout: How many seconds to wait for the connection to be established. Overrides `timeout`
+        :param read_timeout: How many seconds to wait between bytes sent by the server. Overrides `timeout`
+        :param deadline: How many seconds a call may take overall, including retries and backoff. A shorter deadline
+                         set via rest_client.deadlines.deadline takes precedence
+        :param limiter: limits adaptively the amount of in-flight requests towards the host
+        :param dispatcher: shares the request slots among priority classes. The priority class of a request is passed
+                           via the `priority` keyword argument of get, post, put, delete
         """
 
+        if connect_timeout is not None or read_timeout is not None:
+            connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+            timeout = (connect if connect_timeout is None else connect_timeout,
+                       read if read_timeout is None else read_timeout)
+
         self._timeout = timeout
+        self._deadline = deadline
+        self._limiter = limiter
+        self._dispatcher = dispatcher
         self._request_handler = request_handler_maker() if request_handler_maker else requests.sessions.Session()
         self._request_handler.auth = auth
         self._request_handler.cert = cert
@@ -73,11 +189,20 @@ class RequestHandler:
         self._scheme = 'https' if https else 'http'
 
         if retry:
-            retries = Retry(total=retry, backoff_factor=0.1, status_forcelist=[502, 503, 504])
-            self._request_handler.mount(f'{self._scheme}://', HTTPAdapter(max_retries=retries))
+            retries = _DeadlineRetry(total=retry, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+            self._request_handler.mount(f'{self._scheme}://', _DeadlineAdapter(max_retries=retries))
 
         self._base_url = RequestHandler._URL_BASE_FORMAT.format(host=host, scheme=self._scheme)
 
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    @property
+    def session(self) -> t.Any:
+        """The underlying session-like transport, i.e. requests.Session"""
+        return self._request_handler
+
     def get(self,
             url: str,
             params: t.Optional[RequestParams] = None,
@@ -146,8 +271,91 @@ class RequestHandler:
         :return:
         """
         url: str = self._base_url + url
+        priority = kwargs.pop("priority", None)
 
         if "timeout" not in kwargs:
             kwargs["timeout"] = self._timeout
 
-        return request_method(url, **kwargs)
+        with deadlines.deadline(self._deadline):
+            # fail fast before queueing for a slot; the deadline is applied once the request is about to be sent
+            deadlines.check_deadline()
+
+            try:
+                if self._dispatcher is None:
+                    return self._send(request_method, url, **kwargs)
+
+                with self._dispatcher.slot(priority):
+                    return self._send(request_method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self._raise_api_error(e)
+                raise
+
+    def _send(self, request_method: t.Callable, url: str, **kwargs: str) -> t.Type[Response]:
+        """
+        Performs the request within the limits of the concurrency limiter, if any, and feeds it with the outcome
+
+        :param request_method: the method to be called i.e. get, post, put, delete etc
+        :param url: the full URL of this Request
+        :param kwargs: optional extra parameters
+        :return:
+        """
+        if self._limiter is None:
+            if self._dispatcher is not None:
+                profiling.mark_phase('queue_wait')
+
+            return request_method(url, **self._apply_deadline(kwargs))
+
+        self._limiter.acquire()
+        profiling.mark_phase('queue_wait')
+        try:
+            kwargs = self._apply_deadline(kwargs)
+        except DeadlineExceeded:
+            self._limiter.cancel()
+            raise
+
+        started = time.monotonic()
+        success = False
+        try:
+            response = request_method(url, **kwargs)
+            success = response.status_code < 500 and response.status_code != 429
+
+            return response
+        finally:
+            self._limiter.release(time.monotonic() - started, success)
+
+    def _apply_deadline(self, kwargs: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+        """
+        Caps the timeout of the request to the time left until the deadline, if any, and forwards that time to the
+        server. To be called right before sending the request so that any time spent queued is accounted for
+
+        :param kwargs: the keyword arguments of the request
+        :return: the keyword arguments updated accordingly
+        :raises: DeadlineExceeded if the deadline has passed
+        """
+        seconds = deadlines.check_deadline()
+        if seconds is None:
+            return kwargs
+
+        return {
+            **kwargs,
+            "timeout": _cap_timeout(kwargs["timeout"], seconds),
+            "headers": {**(kwargs.get("headers") or {}), self.DEADLINE_HEADER: str(int(seconds * 1000))},
+        }
+
+    @staticmethod
+    def _raise_api_error(error: requests.exceptions.RequestException) -> None:
+        """
+        Raises the APIError matching the given timeout or connection error, if any
+
+        :param error:
+        :raises: DeadlineExceeded, APITimeoutError, APIConnectionError
+        """
+        seconds = deadlines.remaining()
+        if seconds is not None and seconds <= 0:
+            raise DeadlineExceeded() from error
+
+        if isinstance(error, requests.exceptions.Timeout):
+            raise APITimeoutError(str(error)) from error
+
+        if isinstance(error, requests.exceptions.ConnectionError):
+            raise APIConnectionError(str(error)) from error
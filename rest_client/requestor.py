@@ -27,24 +27,40 @@ http://opensource.org/licenses/BSD-3-Clause
 
 Details on EUROCONTROL: http://www.eurocontrol.int
 """
+import json as _json
 import typing as t
-from functools import partial
 
-from rest_client import BaseModel
-from rest_client.typing import RequestParams, RequestHandler
+from rest_client import deadlines
+from rest_client.models import BaseModel
+from rest_client.typing import RequestParams, RequestHandler, Response
 from rest_client.errors import APIError
 
+if t.TYPE_CHECKING:
+    from rest_client.columnar import ColumnSchema
+    from rest_client.disk_cache import DiskCache
+    from rest_client.profiling import Profiler
+
 __author__ = "EUROCONTROL (SWIM)"
 
 
 class Requestor:
     """Manages the entire flow of a HTTP Request/Response"""
 
-    def __init__(self, request_handler: RequestHandler) -> None:
+    # maps the supported HTTP methods to the respective methods of the request handler
+    _REQUEST_METHODS = {'GET': 'get', 'POST': 'post', 'PUT': 'put', 'DELETE': 'delete'}
+
+    def __init__(self,
+                 request_handler: RequestHandler,
+                 cache: t.Optional['DiskCache'] = None,
+                 profiler: t.Optional['Profiler'] = None) -> None:
         """
         :param request_handler: an instance of an object capable of handling http requests, i.e. requests.session()
+        :param cache: persistent cache of the response bodies of the GET requests performed with `cached=True`
+        :param profiler: profiles the calls and logs the slow ones. Cached requests are not profiled
         """
         self._request_handler: RequestHandler = request_handler
+        self._cache: t.Optional['DiskCache'] = cache
+        self._profiler: t.Optional['Profiler'] = profiler
 
     def perform_request(self,
                         method: str,
@@ -52,7 +68,11 @@ class Requestor:
                         extra_params: t.Optional[RequestParams] = None,
                         json: t.Optional[RequestParams] = None,
                         many: bool = False,
-                        response_class: t.Optional[t.Type[BaseModel]] = None) -> t.Union[t.Any, t.List[t.Any]]:
+                        response_class: t.Optional[t.Type[BaseModel]] = None,
+                        priority: t.Optional[str] = None,
+                        cached: bool = False,
+                        columns: t.Optional['ColumnSchema'] = None,
+                        on_response: t.Optional[t.Callable[[Response], None]] = None) -> t.Union[t.Any, t.List[t.Any]]:
         """
         Performs a HTTP Request depending on the given method and processes accordingly the Response
 
@@ -62,37 +82,114 @@ class Requestor:
         :param json: A JSON serializable Python object to send in the body of the Request
         :param many: indicates whether the response is a list of objects or not
         :param response_class: the Python class to be used for deserialization of the Response data
-        :return: response_class or list of response class or dict or list of dict
-        :raises: APIError
+        :param priority: the priority class of the request, see rest_client.priority.PriorityDispatcher
+        :param cached: if True and a cache is configured, a GET request is served from the cache if possible and its
+                       valid response body is stored in the cache otherwise
+        :param columns: if provided, the response is a list which is decoded into column arrays according to this
+                        schema instead of into response_class objects, see rest_client.columnar.ColumnSchema
+        :param on_response: called with the raw response as soon as it is received, i.e. in order to read its headers.
+                            It is not called if the response is served from the cache
+        :return: response_class or list of response class or dict or list of dict or the columns of the response
+        :raises: APIError, DeadlineExceeded if the deadline of the current context (see rest_client.deadlines) has
+                 passed
         """
-        response = self._do_request(method, path, extra_params, json)
+        if cached and self._cache is not None and method == 'GET':
+            return self._perform_cached_request(path, extra_params, many, response_class, priority, columns,
+                                                on_response)
+
+        if self._profiler is not None:
+            return self._perform_profiled_request(method, path, extra_params, json, many, response_class, priority,
+                                                  columns, on_response)
+
+        response = self._do_request(method, path, extra_params, json, priority, on_response)
 
-        processed_response = self._process_response(response, response_class, many)
+        processed_response = self._process_response(response, response_class, many, columns)
 
         return processed_response
 
-    def _do_request(self, method, path, extra_params=None, json=None):
-        methods_map = {
-            'GET': partial(self._request_handler.get, path, params=extra_params or {}, json=json),
-            'POST': partial(self._request_handler.post, path, json=json),
-            'PUT': partial(self._request_handler.put, path, json=json),
-            'DELETE': partial(self._request_handler.delete, path, json=json)
-        }
+    def _perform_cached_request(self, path, extra_params, many, response_class, priority, columns=None,
+                                on_response=None):
+        key = self._get_cache_key(path, extra_params)
 
-        method_func = methods_map.get(method)
+        content = self._cache.get(key)
+        is_cache_miss = content is None
 
-        if not method_func:
-            raise NotImplementedError(f"Method {method} is not implemented")
+        if is_cache_miss:
+            response = self._do_request('GET', path, extra_params, priority=priority, on_response=on_response)
+            self._check_status_code(response)
+            content = response.content
+
+        response_data = _json.loads(content) if len(content) > 0 else None
+
+        # the body is stored only once it was successfully decoded
+        if is_cache_miss:
+            self._cache.set(key, content)
+
+        return self._deserialize(response_data, response_class, many, columns)
+
+    def _perform_profiled_request(self, method, path, extra_params, json, many, response_class, priority,
+                                  columns=None, on_response=None):
+        profile = self._profiler.start(method, path)
+        try:
+            with profile.activate():
+                response = self._do_request(method, path, extra_params, json, priority, on_response)
+            profile.response_received(response)
+
+            self._check_status_code(response)
+            response_data = response.json() if len(response.content) > 0 else None
+            profile.mark('json_decode')
+
+            processed_response = self._deserialize(response_data, response_class, many, columns)
+            profile.mark('from_json')
+
+            return processed_response
+        finally:
+            self._profiler.finish(profile)
+
+    def _get_cache_key(self, path, extra_params):
+        if isinstance(extra_params, dict):
+            extra_params = sorted(extra_params.items())
+
+        return f"{getattr(self._request_handler, 'base_url', '')}{path}?{extra_params or ''}"
 
-        response = method_func()
+    def _do_request(self, method, path, extra_params=None, json=None, priority=None, on_response=None):
+        request_method = self._get_request_method(method)
+
+        kwargs = {'params': extra_params or {}, 'json': json} if method == 'GET' else {'json': json}
+
+        # fail fast before performing the request; the deadline is forwarded to the server by the request handler
+        deadlines.check_deadline()
+
+        if priority is not None:
+            kwargs['priority'] = priority
+
+        response = request_method(path, **kwargs)
+
+        if on_response is not None:
+            on_response(response)
 
         return response
 
-    def _process_response(self, response, response_class, many):
+    def _get_request_method(self, method):
+        method_name = self._REQUEST_METHODS.get(method)
+
+        if not method_name:
+            raise NotImplementedError(f"Method {method} is not implemented")
+
+        return getattr(self._request_handler, method_name)
+
+    def _process_response(self, response, response_class, many, columns=None):
         self._check_status_code(response)
 
         response_data = response.json() if len(response.content) > 0 else None
-        print ("-------------------------- response_data " ,response_data)
+
+        return self._deserialize(response_data, response_class, many, columns)
+
+    @staticmethod
+    def _deserialize(response_data, response_class, many, columns=None):
+        if columns is not None:
+            return columns.decode(response_data)
+
         if response_class and response_data:
             if many:
                 response_data = (response_class.from_json(r) for r in response_data)
@@ -0,0 +1,206 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import threading
+import typing as t
+from operator import attrgetter
+
+from rest_client.models import BaseModel
+from rest_client.requestor import Requestor
+from rest_client.typing import RequestParams, Response
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+class CollectionSync:
+    """
+        Maintains a local copy of a remote collection, indexed by ID, by fetching only the items that changed since
+        the previous sync. The API is expected to accept a watermark query parameter (i.e. an updated-since timestamp,
+        a version or an opaque cursor) and return the items changed after it. The new watermark is the highest one of
+        the fetched items or, if `next_watermark` is provided, the one it extracts from the response, i.e. a cursor
+        issued by the server in a response header.
+
+            users = CollectionSync(client, 'users', User, watermark_param='updated_since')
+            users.sync()
+            users.get(user_id)
+
+            events = CollectionSync(client, 'events', Event, watermark_param='cursor',
+                                    next_watermark=lambda response: response.headers.get('X-Next-Cursor'))
+    """
+
+    def __init__(self,
+                 requestor: Requestor,
+                 path: str,
+                 response_class: t.Type[BaseModel],
+                 key: t.Callable[[BaseModel], t.Hashable] = attrgetter('id'),
+                 watermark: t.Callable[[BaseModel], t.Any] = attrgetter('updated_at'),
+                 watermark_param: str = 'updated_since',
+                 is_deleted: t.Optional[t.Callable[[BaseModel], bool]] = None,
+                 extra_params: t.Optional[t.Dict[str, t.Any]] = None,
+                 next_watermark: t.Optional[t.Callable[[Response], t.Any]] = None,
+                 priority: t.Optional[str] = None) -> None:
+        """
+        :param requestor: the client of the API
+        :param path: the URI of the collection
+        :param response_class: the Python class to be used for deserialization of the items
+        :param key: returns the ID of an item
+        :param watermark: returns the watermark of an item. Watermarks must be comparable with each other
+        :param watermark_param: the query parameter via which the current watermark is sent
+        :param is_deleted: returns whether an item is a tombstone of a deleted one. If None no item is ever deleted
+        :param extra_params: additional query parameters of every sync request
+        :param next_watermark: returns the next watermark from the raw response of a sync request. If provided, the
+                               `watermark` of the items is ignored and if it returns None the current watermark is
+                               kept
+        :param priority: the priority class of the sync requests, see rest_client.priority.PriorityDispatcher
+        """
+        self._requestor = requestor
+        self._path = path
+        self._response_class = response_class
+        self._key = key
+        self._watermark_of = watermark
+        self._watermark_param = watermark_param
+        self._is_deleted = is_deleted
+        self._extra_params: t.Dict[str, t.Any] = extra_params or {}
+        self._next_watermark = next_watermark
+        self._priority = priority
+
+        self._items: t.Dict[t.Hashable, BaseModel] = {}
+        self._indexes: t.Dict[str, t.Tuple[t.Callable, t.Dict[t.Hashable, t.Dict[t.Hashable, BaseModel]]]] = {}
+        self._watermark: t.Any = None
+        self._lock = threading.RLock()
+
+    @property
+    def watermark(self) -> t.Any:
+        """The watermark to be sent by the next sync or None if the collection was never synced"""
+        return self._watermark
+
+    def sync(self) -> int:
+        """
+        Fetches the items changed since the previous sync, or all of them upon first sync, and merges them in the
+        local copy
+
+        :return: the amount of changed items
+        :raises: APIError
+        """
+        params: RequestParams = dict(self._extra_params)
+        if self._watermark is not None:
+            params[self._watermark_param] = self._watermark
+
+        responses: t.List[Response] = []
+        changes = self._requestor.perform_request('GET',
+                                                  self._path,
+                                                  extra_params=params,
+                                                  many=True,
+                                                  response_class=self._response_class,
+                                                  priority=self._priority,
+                                                  on_response=responses.append) or []
+
+        watermark = self._next_watermark(responses[-1]) if self._next_watermark is not None else None
+
+        with self._lock:
+            for item in changes:
+                self._merge(item)
+
+            if watermark is not None:
+                self._watermark = watermark
+
+        return len(changes)
+
+    def reset(self) -> None:
+        """Drops the local copy so that the next sync fetches the whole collection"""
+        with self._lock:
+            self._items.clear()
+            for _, index in self._indexes.values():
+                index.clear()
+            self._watermark = None
+
+    def add_index(self, name: str, key: t.Callable[[BaseModel], t.Hashable]) -> None:
+        """
+        Adds a secondary index to be used via `find`
+
+        :param name: the name of the index
+        :param key: returns the indexed value of an item
+        """
+        with self._lock:
+            index = {}
+            for item_id, item in self._items.items():
+                index.setdefault(key(item), {})[item_id] = item
+
+            self._indexes[name] = (key, index)
+
+    def find(self, name: str, value: t.Hashable) -> t.List[BaseModel]:
+        """
+        :param name: the name of a secondary index
+        :param value: the indexed value
+        :return: the items with the given indexed value
+        """
+        _, index = self._indexes[name]
+
+        return list(index.get(value, {}).values())
+
+    def get(self, item_id: t.Hashable, default: t.Optional[BaseModel] = None) -> t.Optional[BaseModel]:
+        return self._items.get(item_id, default)
+
+    def __getitem__(self, item_id: t.Hashable) -> BaseModel:
+        return self._items[item_id]
+
+    def __contains__(self, item_id: t.Hashable) -> bool:
+        return item_id in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> t.Iterator[BaseModel]:
+        return iter(list(self._items.values()))
+
+    def _merge(self, item: BaseModel) -> None:
+        item_id = self._key(item)
+
+        previous = self._items.pop(item_id, None)
+        if previous is not None:
+            self._unindex(item_id, previous)
+
+        if self._is_deleted is None or not self._is_deleted(item):
+            self._items[item_id] = item
+            for key, index in self._indexes.values():
+                index.setdefault(key(item), {})[item_id] = item
+
+        if self._next_watermark is None:
+            watermark = self._watermark_of(item)
+            if self._watermark is None or watermark > self._watermark:
+                self._watermark = watermark
+
+    def _unindex(self, item_id: t.Hashable, item: BaseModel) -> None:
+        for key, index in self._indexes.values():
+            value = key(item)
+            items = index.get(value)
+            if items is not None:
+                items.pop(item_id, None)
+                if not items:
+                    del index[value]
@@ -0,0 +1,178 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import sys
+import threading
+import typing as t
+
+from rest_client.typing import Response
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+class HTTP2Session:
+    """
+        Session-like transport which multiplexes the requests towards a host as concurrent streams over a single HTTP/2
+        connection instead of opening one HTTP/1.1 connection per in-flight request.
+        It exposes the same interface as requests.Session (get, post, put, delete, mount, auth, cert, verify) so that it
+        can be plugged in RequestHandler via its `request_handler_maker` hook.
+        Requires the optional `httpx[http2]` dependency.
+    """
+
+    def __init__(self, max_connections: int = 10) -> None:
+        """
+        :param max_connections: how many connections may be opened towards the host. Over HTTP/2 the requests are
+                                multiplexed over the first one, while the rest serve concurrent requests if the host
+                                does not negotiate HTTP/2 and the client falls back to HTTP/1.1
+        """
+        self.auth: t.Optional[tuple] = None
+        self.cert: t.Optional[t.Union[str, t.Tuple[str, str]]] = None
+        self.verify: t.Union[bool, str] = True
+
+        self._max_connections = max_connections
+        self._retries: int = 0
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """
+        The underlying httpx.Client which is created upon first use so that auth, cert, verify and mount can be set
+        beforehand, the same way they are set on a requests.Session.
+        """
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._make_client()
+
+        return self._client
+
+    def mount(self, prefix: str, adapter: t.Any) -> None:
+        """
+        Keeps the retry configuration of a requests.adapters.HTTPAdapter. Note that httpx retries only on connection
+        errors.
+
+        :param prefix: ignored, the session serves a single host
+        :param adapter: an instance of requests.adapters.HTTPAdapter
+        """
+        max_retries = getattr(adapter, 'max_retries', None)
+
+        self._retries = getattr(max_retries, 'total', max_retries) or 0
+
+    def get(self, url: str, **kwargs: t.Any) -> t.Type[Response]:
+        return self._request('GET', url, **kwargs)
+
+    def delete(self, url: str, **kwargs: t.Any) -> t.Type[Response]:
+        return self._request('DELETE', url, **kwargs)
+
+    def post(self, url: str, **kwargs: t.Any) -> t.Type[Response]:
+        return self._request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs: t.Any) -> t.Type[Response]:
+        return self._request('PUT', url, **kwargs)
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _request(self, method: str, url: str, **kwargs: t.Any) -> t.Type[Response]:
+        """
+        Translates the requests.Session keyword arguments to their httpx counterparts and performs the request
+
+        :param method: one of GET, POST, PUT, DELETE
+        :param url: the full URL of this Request
+        :param kwargs: requests.Session style keyword arguments
+        :return: httpx.Response which shares the status_code, content, text, json() interface of requests.Response
+        :raises requests.exceptions.RequestException: the httpx transport errors are translated to their requests
+                                                       counterparts so that RequestHandler maps them the same way
+        """
+        data = kwargs.pop('data', None)
+        if isinstance(data, (bytes, str)):
+            kwargs['content'] = data
+        elif data is not None:
+            kwargs['data'] = data
+
+        if 'allow_redirects' in kwargs:
+            kwargs['follow_redirects'] = kwargs.pop('allow_redirects')
+
+        if isinstance(kwargs.get('timeout'), tuple):
+            kwargs['timeout'] = self._make_timeout(*kwargs['timeout'])
+
+        try:
+            return self.client.request(method, url, **kwargs)
+        except Exception as e:
+            # an httpx error can only be raised once httpx has been imported
+            httpx = sys.modules.get('httpx')
+            if httpx is None or not isinstance(e, httpx.TransportError):
+                raise
+            raise _to_requests_error(httpx, e) from e
+
+    def _make_client(self):
+        httpx = _import_httpx()
+
+        transport = httpx.HTTPTransport(http2=True,
+                                        verify=self.verify,
+                                        cert=self.cert,
+                                        retries=self._retries,
+                                        limits=httpx.Limits(max_connections=self._max_connections))
+
+        return httpx.Client(auth=self.auth or None, transport=transport, follow_redirects=True)
+
+    @staticmethod
+    def _make_timeout(connect: t.Optional[float], read: t.Optional[float]):
+        # waiting for a pooled connection is bound by the connect timeout, like opening a new one
+        return _import_httpx().Timeout(None, connect=connect, read=read, pool=connect)
+
+
+def _to_requests_error(httpx, error: Exception) -> Exception:
+    """
+    Translates an httpx.TransportError to the matching requests exception
+    """
+    from requests import exceptions
+
+    if isinstance(error, httpx.ConnectTimeout):
+        error_class = exceptions.ConnectTimeout
+    elif isinstance(error, httpx.TimeoutException):
+        error_class = exceptions.ReadTimeout
+    elif isinstance(error, (httpx.NetworkError, httpx.ProxyError)):
+        error_class = exceptions.ConnectionError
+    else:
+        error_class = exceptions.RequestException
+
+    return error_class(str(error))
+
+
+def _import_httpx():
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError("HTTP/2 support requires the 'httpx[http2]' package: pip install rest-client[http2]") from e
+
+    return httpx
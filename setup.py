@@ -42,6 +42,12 @@ setup(
     install_requires=[
         'requests'
     ],
+    extras_require={
+        'http2': ['httpx[http2]']
+    },
+    entry_points={
+        'console_scripts': ['rest-client-loadgen=rest_client.loadgen:main']
+    },
     tests_require=[
         'pytest',
         'pytest-cov'
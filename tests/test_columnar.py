@@ -0,0 +1,160 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import array
+import math
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+from rest_client import Endpoint, Requestor
+from rest_client.columnar import ColumnSchema
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+ROWS = [
+    {'id': 1, 'lat': 50.9, 'active': True, 'callsign': 'ABC', 'extra': 'ignored'},
+    {'id': 2, 'lat': None, 'active': False, 'callsign': 'DEF', 'extra': 'ignored'},
+]
+
+COLUMNS = {'id': int, 'lat': float, 'active': bool, 'callsign': str}
+
+
+@pytest.mark.parametrize('columns, backend', [
+    ({'a': list}, 'python'),
+    ({'a': int}, 'unknown'),
+])
+def test_column_schema__invalid__raises_valueerror(columns, backend):
+    with pytest.raises(ValueError):
+        ColumnSchema(columns, backend=backend)
+
+
+def test_decode__python_backend():
+    columns = ColumnSchema(COLUMNS, backend='python').decode(ROWS)
+
+    assert array.array('q', [1, 2]) == columns['id']
+    assert 50.9 == columns['lat'][0]
+    assert math.isnan(columns['lat'][1])
+    assert [True, False] == columns['active']
+    assert ['ABC', 'DEF'] == columns['callsign']
+    assert 'extra' not in columns
+
+
+@pytest.mark.parametrize('backend', ['python', 'auto'])
+def test_decode__empty_response(backend):
+    columns = ColumnSchema(COLUMNS, backend=backend).decode(None)
+
+    assert {'id', 'lat', 'active', 'callsign'} == set(columns)
+    assert all(0 == len(column) for column in columns.values())
+
+
+def test_decode__numpy_backend():
+    np = pytest.importorskip('numpy')
+
+    columns = ColumnSchema(COLUMNS, backend='numpy').decode(ROWS)
+
+    assert np.int64 == columns['id'].dtype
+    assert [1, 2] == columns['id'].tolist()
+    assert np.isnan(columns['lat'][1])
+    assert np.bool_ == columns['active'].dtype
+    assert ['ABC', 'DEF'] == columns['callsign'].tolist()
+
+
+def test_decode__pandas_backend():
+    pytest.importorskip('pandas')
+
+    df = ColumnSchema(COLUMNS, backend='pandas').decode(ROWS)
+
+    assert ['id', 'lat', 'active', 'callsign'] == list(df.columns)
+    assert [1, 2] == df['id'].tolist()
+
+
+def test_decode__arrow_backend():
+    pytest.importorskip('pyarrow')
+
+    table = ColumnSchema(COLUMNS, backend='arrow').decode(ROWS)
+
+    assert [50.9, None] == table.column('lat').to_pylist()
+    assert ['ABC', 'DEF'] == table.column('callsign').to_pylist()
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy', 'pandas'])
+@pytest.mark.parametrize('column_type', [int, bool])
+def test_decode__null_in_int_or_bool_column__raises_valueerror(backend, column_type):
+    if backend != 'python':
+        pytest.importorskip(backend)
+
+    with pytest.raises(ValueError) as e:
+        ColumnSchema({'a': column_type}, backend=backend).decode([{'a': None}, {'a': True}])
+    assert "Column 'a'" in str(e.value)
+
+
+def test_decode__arrow_backend__nulls_are_kept():
+    pytest.importorskip('pyarrow')
+
+    table = ColumnSchema({'a': bool, 'b': int}, backend='arrow').decode([{'a': None, 'b': None}, {'a': True, 'b': 1}])
+
+    assert [None, True] == table.column('a').to_pylist()
+    assert [None, 1] == table.column('b').to_pylist()
+
+
+def test_decode__missing_optional_dependency__raises_importerror(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+
+    with pytest.raises(ImportError) as e:
+        ColumnSchema(COLUMNS, backend='numpy').decode(ROWS)
+    assert "'numpy' package" in str(e.value)
+
+
+def _make_request_handler():
+    response = Mock()
+    response.status_code = 200
+    response.content = ROWS
+    response.json = Mock(return_value=ROWS)
+
+    return Mock(get=Mock(return_value=response))
+
+
+def test_requestor__columns__response_is_decoded_into_columns():
+    requestor = Requestor(request_handler=_make_request_handler())
+
+    columns = requestor.perform_request('GET', 'path', columns=ColumnSchema({'id': int}, backend='python'))
+
+    assert {'id': array.array('q', [1, 2])} == columns
+
+
+def test_endpoint__columns__response_is_decoded_into_columns():
+    class Client(Requestor):
+        get_items = Endpoint('GET', 'items', columns=ColumnSchema({'callsign': str}, backend='python'))
+
+    client = Client(request_handler=_make_request_handler())
+
+    assert {'callsign': ['ABC', 'DEF']} == client.get_items()
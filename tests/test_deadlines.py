@@ -0,0 +1,69 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import time
+
+import pytest
+
+from rest_client import deadlines
+from rest_client.errors import DeadlineExceeded
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+def test_remaining__no_deadline__returns_none():
+    assert deadlines.remaining() is None
+    assert deadlines.check_deadline() is None
+
+
+def test_deadline__is_reset_upon_exit():
+    with deadlines.deadline(10):
+        assert 9 < deadlines.remaining() <= 10
+
+    assert deadlines.remaining() is None
+
+
+@pytest.mark.parametrize('outer, inner, expected_max', [
+    (10, 1, 1),
+    (1, 10, 1),
+    (1, None, 1),
+])
+def test_deadline__nested_deadline_can_only_shorten_the_enclosing_one(outer, inner, expected_max):
+    with deadlines.deadline(outer):
+        with deadlines.deadline(inner):
+            assert expected_max - 1 < deadlines.remaining() <= expected_max
+
+
+def test_check_deadline__expired__raises_deadlineexceeded():
+    with deadlines.deadline(0.01):
+        time.sleep(0.02)
+
+        with pytest.raises(DeadlineExceeded) as e:
+            deadlines.check_deadline()
+        assert "[None] - Deadline exceeded" == str(e.value)
@@ -0,0 +1,207 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import multiprocessing
+import os
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from rest_client import Requestor
+from rest_client.disk_cache import DiskCache, fcntl
+from tests.utils import TestModel
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = DiskCache(str(tmp_path), max_size=100, slots=16)
+    yield cache
+    cache.close()
+
+
+def test_disk_cache__get_set_delete(cache):
+    assert cache.get('key') is None
+
+    cache.set('key', b'value')
+    assert b'value' == cache.get('key')
+
+    cache.set('key', b'other value')
+    assert b'other value' == cache.get('key')
+    assert 11 == cache.size
+
+    cache.delete('key')
+    assert cache.get('key') is None
+    assert 0 == cache.size
+
+
+def test_disk_cache__survives_restarts(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set('key', b'value')
+    cache.close()
+
+    cache = DiskCache(str(tmp_path))
+    assert b'value' == cache.get('key')
+    assert 5 == cache.size
+
+
+def test_disk_cache__used_slot_count__is_recounted_upon_opening(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    for key in ('a', 'b', 'c'):
+        cache.set(key, b'value')
+    cache._set_count(0)
+    cache.close()
+
+    cache = DiskCache(str(tmp_path))
+    assert 3 == len(cache)
+    cache.delete('a')
+    assert 2 == len(cache)
+
+
+def test_disk_cache__set_without_eviction__does_not_scan_the_index(tmp_path):
+    cache = DiskCache(str(tmp_path), slots=65536)
+
+    started = time.perf_counter()
+    for i in range(20):
+        cache.set(str(i), b'value')
+
+    assert time.perf_counter() - started < 0.2
+    assert 20 == len(cache)
+
+
+def test_disk_cache__invalid_index__raises_valueerror(tmp_path):
+    (tmp_path / 'index').write_bytes(b'invalid')
+
+    with pytest.raises(ValueError):
+        DiskCache(str(tmp_path))
+
+
+def test_disk_cache__expired_value__is_not_served(tmp_path):
+    cache = DiskCache(str(tmp_path), max_age=0.01)
+    cache.set('key', b'value')
+
+    time.sleep(0.02)
+
+    assert cache.get('key') is None
+
+
+def test_disk_cache__least_recently_accessed_values_are_evicted_upon_max_size(cache):
+    cache.set('a', b'a' * 40)
+    cache.set('b', b'b' * 40)
+    cache.get('a')
+
+    cache.set('c', b'c' * 40)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert 80 == cache.size
+
+
+def test_disk_cache__values_are_evicted_upon_slots(cache):
+    for i in range(30):
+        cache.set(str(i), b'v')
+
+    assert 12 == len(cache)
+    assert all(b'v' == cache.get(str(i)) for i in range(18, 30))
+    assert 12 == len(os.listdir(os.path.join(cache._directory, 'data')))
+
+
+def test_disk_cache__value_larger_than_max_size__is_not_stored(cache):
+    cache.set('key', b'v' * 101)
+
+    assert cache.get('key') is None
+
+
+def test_disk_cache__clear(cache):
+    for i in range(5):
+        cache.set(str(i), b'v')
+
+    cache.clear()
+
+    assert 0 == len(cache)
+    assert 0 == cache.size
+    assert [] == os.listdir(os.path.join(cache._directory, 'data'))
+
+
+def _fill(directory, prefix):
+    cache = DiskCache(directory, slots=512)
+    for i in range(100):
+        cache.set(f'{prefix}{i}', f'{prefix}{i}'.encode())
+    cache.close()
+
+
+@pytest.mark.skipif(fcntl is None, reason="requires fcntl")
+def test_disk_cache__is_shared_between_processes(tmp_path):
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=_fill, args=(str(tmp_path), prefix)) for prefix in 'ab']
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    cache = DiskCache(str(tmp_path))
+    assert 200 == len(cache)
+    assert all(f'{prefix}{i}'.encode() == cache.get(f'{prefix}{i}') for prefix in 'ab' for i in range(100))
+
+
+def test_requestor__cached_get__is_served_from_the_cache_upon_warm_start(cache):
+    response = Mock()
+    response.status_code = 200
+    response.content = b'[{"a": 1, "b": 2}]'
+    mock_request_handler = Mock()
+    mock_request_handler.get = Mock(return_value=response)
+
+    for _ in range(2):
+        requestor = Requestor(request_handler=mock_request_handler, cache=cache)
+        result = requestor.perform_request('GET', 'path', extra_params={'c': 3}, many=True,
+                                           response_class=TestModel, cached=True)
+
+        assert [TestModel(a=1, b=2)] == result
+
+    mock_request_handler.get.assert_called_once()
+
+
+@pytest.mark.parametrize('status_code, content, expected_error', [
+    (200, b'invalid', ValueError),
+    (500, b'{}', Exception),
+])
+def test_requestor__cached_get__invalid_response_is_not_stored(cache, status_code, content, expected_error):
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+
+    requestor = Requestor(request_handler=Mock(get=Mock(return_value=response)), cache=cache)
+
+    with pytest.raises(expected_error):
+        requestor.perform_request('GET', 'path', cached=True)
+
+    assert 0 == len(cache)
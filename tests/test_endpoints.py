@@ -0,0 +1,140 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from rest_client import Endpoint, Requestor
+from tests.utils import TestModel
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+class Client(Requestor):
+    get_model = Endpoint('GET', 'models/{model_id}', response_class=TestModel)
+    get_models = Endpoint('GET', 'models', response_class=TestModel, many=True)
+    update_model = Endpoint('PUT', 'groups/{group}/models/{model_id}')
+
+
+def _make_response(data):
+    response = Mock()
+    response.status_code = 200
+    response.content = data
+    response.json = Mock(return_value=data)
+
+    return response
+
+
+@pytest.mark.parametrize('method', [None, 'wrong', 'get', 'gets'])
+def test_endpoint__wrong_method__raises_notimplementederror(method):
+    with pytest.raises(NotImplementedError) as e:
+        Endpoint(method, 'path')
+    assert f"Method {method} is not implemented" == str(e.value)
+
+
+@pytest.mark.parametrize('path, path_params, expected_url', [
+    ('models', {}, 'models'),
+    ('models/{model_id}', {'model_id': 1}, 'models/1'),
+    ('models/{model_id}/', {'model_id': 'a b/c'}, 'models/a%20b%2Fc/'),
+    ('groups/{group}/models/{model_id}', {'group': 'g', 'model_id': 2}, 'groups/g/models/2'),
+])
+def test_endpoint_url(path, path_params, expected_url):
+    assert expected_url == Endpoint('GET', path).url(**path_params)
+
+
+def test_endpoint_url__equal_values_of_different_types__are_encoded_separately():
+    endpoint = Endpoint('GET', 'items/{v}')
+
+    assert ['items/True', 'items/1.0', 'items/0.0', 'items/False', 'items/%5B1%2C%202%5D'] == \
+        [endpoint.url(v=v) for v in (True, 1.0, 0.0, False, [1, 2])]
+
+
+def test_endpoint_url__missing_path_parameter__raises_typeerror():
+    with pytest.raises(TypeError) as e:
+        Endpoint('GET', 'groups/{group}/models/{model_id}').url(group='g')
+    assert "Missing path parameter(s) for 'groups/{group}/models/{model_id}': model_id" == str(e.value)
+
+
+def test_endpoint_url__unexpected_path_parameter__raises_typeerror():
+    with pytest.raises(TypeError) as e:
+        Endpoint('GET', 'users').url(extra_param={'a': 1})
+    assert "Unexpected path parameter(s) for 'users': extra_param" == str(e.value)
+
+
+@pytest.mark.parametrize('name', ['extra_params', 'json', 'priority', 'cached'])
+def test_endpoint__reserved_path_parameter__raises_valueerror(name):
+    with pytest.raises(ValueError):
+        Endpoint('GET', f'users/{{{name}}}')
+
+
+def test_bound_endpoint__is_cached_on_the_instance():
+    client = Client(request_handler=Mock())
+
+    assert client.get_model is client.get_model
+    assert isinstance(Client.get_model, Endpoint)
+
+
+@pytest.mark.parametrize('endpoint_name, path_params, data, expected_url, expected_object', [
+    ('get_model', {'model_id': 1}, {'a': 1, 'b': 2}, 'models/1', TestModel(a=1, b=2)),
+    ('get_models', {}, [{'a': 1, 'b': 2}, {'a': 3, 'b': 4}], 'models', [TestModel(a=1, b=2), TestModel(a=3, b=4)]),
+])
+def test_bound_endpoint__get__response_is_processed(endpoint_name, path_params, data, expected_url,
+                                                    expected_object):
+    mock_request_handler = Mock()
+    mock_request_handler.get = Mock(return_value=_make_response(data))
+
+    client = Client(request_handler=mock_request_handler)
+
+    result = getattr(client, endpoint_name)(extra_params={'c': 3}, **path_params)
+
+    mock_request_handler.get.assert_called_once_with(expected_url, params={'c': 3}, json=None)
+    assert expected_object == result
+
+
+def test_bound_endpoint__put__json_is_sent():
+    mock_request_handler = Mock()
+    mock_request_handler.put = Mock(return_value=_make_response({'a': 1}))
+
+    client = Client(request_handler=mock_request_handler)
+
+    result = client.update_model(json={'a': 1}, group='g', model_id=2)
+
+    mock_request_handler.put.assert_called_once_with('groups/g/models/2', json={'a': 1})
+    assert {'a': 1} == result
+
+
+def test_bound_endpoint__misspelled_keyword__raises_typeerror_without_performing_the_request():
+    mock_request_handler = Mock()
+
+    client = Client(request_handler=mock_request_handler)
+
+    with pytest.raises(TypeError):
+        client.get_models(extra_param={'a': 1})
+    mock_request_handler.get.assert_not_called()
@@ -27,9 +27,14 @@ http://opensource.org/licenses/BSD-3-Clause
 
 Details on EUROCONTROL: http://www.eurocontrol.int
 """
+import time
+from email.utils import formatdate
 from unittest.mock import Mock
 
-from rest_client.errors import APIError
+import pytest
+
+from rest_client.errors import APIError, ClientError, NotFoundError, ConflictError, TooManyRequestsError, \
+    ServerError, APITimeoutError, APIConnectionError, DeadlineExceeded
 
 __author__ = "EUROCONTROL (SWIM)"
 
@@ -63,3 +68,93 @@ def test_api_error_from_response__empty_list_for_404_error_is_ignored():
     assert expected_detail == api_error.detail
     assert status_code == api_error.status_code
     assert f"[{status_code}] - {expected_detail}" == str(api_error)
+
+
+@pytest.mark.parametrize('status_code, expected_error_class', [
+    (400, ClientError),
+    (403, ClientError),
+    (404, NotFoundError),
+    (409, ConflictError),
+    (429, TooManyRequestsError),
+    (500, ServerError),
+    (503, ServerError),
+    (302, APIError),
+])
+def test_api_error_from_response__error_class_matches_the_status_code(status_code, expected_error_class):
+    response = Mock()
+    response.status_code = status_code
+
+    api_error = APIError.from_response(response)
+
+    assert expected_error_class == type(api_error)
+
+
+def test_api_error_from_response__detail_is_parsed_lazily():
+    response = Mock()
+    response.status_code = 500
+    response.content = b'{"detail": "some_error"}'
+    response.json = Mock(return_value={'detail': 'some_error'})
+
+    api_error = APIError.from_response(response)
+    response.json.assert_not_called()
+
+    assert 'some_error' == api_error.detail
+    assert 'some_error' == api_error.detail
+    response.json.assert_called_once()
+
+
+def test_api_error_from_response__large_body__is_truncated_and_not_decoded():
+    response = Mock()
+    response.status_code = 502
+    response.content = b'<html>' + b'a' * APIError.MAX_DETAIL_SIZE
+
+    api_error = APIError.from_response(response)
+
+    assert '<html>' + 'a' * (APIError.MAX_DETAIL_SIZE - 6) + '...' == api_error.detail
+    response.json.assert_not_called()
+
+
+def test_api_error_from_response__non_json_body__text_is_used():
+    response = Mock()
+    response.status_code = 500
+    response.content = b'error'
+    response.text = 'error'
+    response.json = Mock(side_effect=ValueError())
+
+    assert 'error' == APIError.from_response(response).detail
+
+
+@pytest.mark.parametrize('headers, expected_retry_after', [
+    ({}, None),
+    ({'Retry-After': '120'}, 120),
+    ({'Retry-After': '-1'}, 0),
+    ({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}, 0),
+    ({'Retry-After': 'invalid'}, None),
+])
+def test_api_error__retry_after(headers, expected_retry_after):
+    response = Mock()
+    response.status_code = 429
+    response.headers = headers
+
+    assert expected_retry_after == APIError.from_response(response).retry_after
+
+
+def test_api_error__retry_after__future_http_date():
+    response = Mock()
+    response.status_code = 503
+    response.headers = {'Retry-After': formatdate(time.time() + 60, usegmt=True)}
+
+    assert 55 < APIError.from_response(response).retry_after <= 60
+
+
+@pytest.mark.parametrize('error_class, expected_base_class', [
+    (DeadlineExceeded, APITimeoutError),
+    (APITimeoutError, APIError),
+    (APIConnectionError, APIError),
+])
+def test_status_free_errors(error_class, expected_base_class):
+    error = error_class()
+
+    assert isinstance(error, expected_base_class)
+    assert error.status_code is None
+    assert error.retry_after is None
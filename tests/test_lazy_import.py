@@ -0,0 +1,60 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import subprocess
+import sys
+
+import pytest
+
+import rest_client
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+@pytest.mark.parametrize('statement, expected_loaded', [
+    ('from rest_client import BaseModel', False),
+    ('from rest_client import Requestor, Endpoint', False),
+    ('from rest_client import ClientFactory', False),
+    ('from rest_client import RequestHandler', True),
+])
+def test_transports_are_loaded_upon_first_use(statement, expected_loaded):
+    output = subprocess.run([sys.executable, '-c', f"import sys; {statement}; print('requests' in sys.modules)"],
+                            check=True, capture_output=True, text=True).stdout
+
+    assert str(expected_loaded) == output.strip()
+
+
+def test_lazy_attributes():
+    from rest_client.request_handler import RequestHandler
+
+    assert RequestHandler is rest_client.RequestHandler
+    assert set(rest_client.__all__) <= set(dir(rest_client))
+
+    with pytest.raises(AttributeError):
+        rest_client.Unknown
@@ -0,0 +1,183 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from rest_client import RequestHandler, deadlines
+from rest_client.errors import ConcurrencyLimitExceeded
+from rest_client.limiter import AdaptiveLimiter
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+def _release_saturated(limiter, latency, success):
+    while limiter.in_flight < limiter.limit:
+        limiter.acquire()
+
+    limiter.release(latency=latency, success=success)
+
+
+def test_limiter__saturated_success_within_latency_threshold__increases_the_limit_additively():
+    limiter = AdaptiveLimiter(initial_limit=2, latency_threshold=1)
+
+    for _ in range(4):
+        _release_saturated(limiter, latency=0.1, success=True)
+
+    assert 3 == limiter.limit
+
+
+def test_limiter__unsaturated_success__keeps_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=2, latency_threshold=1)
+
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(latency=0.1, success=True)
+
+    assert 2 == limiter.limit
+    assert 0 == limiter.in_flight
+
+
+@pytest.mark.parametrize('latency, success', [
+    (0.1, False),
+    (2, True),
+])
+def test_limiter__error_or_slow_call__decreases_the_limit_multiplicatively(latency, success):
+    limiter = AdaptiveLimiter(initial_limit=10, latency_threshold=1, backoff_ratio=0.5)
+
+    limiter.acquire()
+    limiter.release(latency=latency, success=success)
+
+    assert 5 == limiter.limit
+
+
+def test_limiter__burst_of_failures__decreases_the_limit_once():
+    limiter = AdaptiveLimiter(initial_limit=100, backoff_ratio=0.9)
+
+    acquired_at = time.monotonic()
+    for _ in range(100):
+        limiter.acquire()
+    time.sleep(0.01)
+    for _ in range(100):
+        limiter.release(latency=time.monotonic() - acquired_at, success=False)
+
+    assert 90 == limiter.limit
+
+    limiter.acquire()
+    limiter.release(latency=0, success=False)
+
+    assert 81 == limiter.limit
+
+
+def test_limiter__limit_stays_within_bounds():
+    limiter = AdaptiveLimiter(initial_limit=2, min_limit=1, max_limit=2, backoff_ratio=0.1)
+
+    limiter.acquire()
+    limiter.release(latency=0, success=False)
+    assert 1 == limiter.limit
+
+    for _ in range(10):
+        _release_saturated(limiter, latency=0, success=True)
+    assert 2 == limiter.limit
+
+
+def test_limiter__limit_reached__waits_at_most_max_wait():
+    limiter = AdaptiveLimiter(initial_limit=1, max_wait=0.01)
+    limiter.acquire()
+
+    with pytest.raises(ConcurrencyLimitExceeded):
+        limiter.acquire()
+
+    assert {'limit': 1, 'in_flight': 1, 'queued': 0} == limiter.metrics()
+
+
+def test_limiter__limit_reached__wait_is_bound_by_the_deadline():
+    limiter = AdaptiveLimiter(initial_limit=1)
+    limiter.acquire()
+
+    with deadlines.deadline(0.01):
+        with pytest.raises(ConcurrencyLimitExceeded):
+            limiter.acquire()
+
+
+def test_limiter__queued_caller_proceeds_upon_release():
+    limiter = AdaptiveLimiter(initial_limit=1, max_wait=5)
+    limiter.acquire()
+
+    waiter = threading.Thread(target=limiter.acquire)
+    waiter.start()
+    limiter.release(latency=0, success=True)
+    waiter.join(timeout=5)
+
+    assert not waiter.is_alive()
+    assert 1 == limiter.in_flight
+
+
+def test_limiter__cancel__frees_the_slot_without_adapting_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=1)
+    limiter.acquire()
+
+    limiter.cancel()
+
+    assert {'limit': 1, 'in_flight': 0, 'queued': 0} == limiter.metrics()
+
+
+@pytest.mark.parametrize('status_code, expected_success', [
+    (200, True),
+    (404, True),
+    (429, False),
+    (503, False),
+])
+def test_request_handler__limiter_is_fed_with_the_outcome(status_code, expected_success):
+    mock_client = Mock()
+    mock_client.get = Mock(return_value=Mock(status_code=status_code))
+    limiter = Mock()
+
+    client = RequestHandler('some_host.com', limiter=limiter, request_handler_maker=Mock(return_value=mock_client))
+    client.get('endpoint')
+
+    limiter.acquire.assert_called_once()
+    assert expected_success == limiter.release.call_args[0][1]
+
+
+def test_request_handler__request_error__limiter_is_released_as_failure():
+    mock_client = Mock()
+    mock_client.get = Mock(side_effect=ConnectionError())
+    limiter = AdaptiveLimiter(initial_limit=10, backoff_ratio=0.5)
+
+    client = RequestHandler('some_host.com', limiter=limiter, request_handler_maker=Mock(return_value=mock_client))
+
+    with pytest.raises(ConnectionError):
+        client.get('endpoint')
+
+    assert 5 == limiter.limit
+    assert 0 == limiter.in_flight
@@ -0,0 +1,157 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from rest_client.loadgen import LoadGenerator, percentile, format_report, main, DEFAULT_TIMEOUT
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # a buffered writer sends headers and body together, avoiding Nagle's algorithm delays on keep-alive connections
+    wbufsize = -1
+
+    def do_GET(self):
+        status_code, body = (404, b'{"detail": "not found"}') if self.path.startswith('/missing') else (200, b'[]')
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def scenario():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+
+    yield {
+        'host': f'127.0.0.1:{server.server_port}',
+        'https': False,
+        'timeout': 5,
+        'calls': [
+            {'method': 'GET', 'path': 'items', 'weight': 3},
+            {'method': 'GET', 'path': 'missing', 'weight': 1},
+        ]
+    }
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('p, expected', [
+    (50, 5),
+    (90, 9),
+    (99, 10),
+    (100, 10),
+])
+def test_percentile(p, expected):
+    assert expected == percentile(list(range(1, 11)), p)
+
+
+def test_percentile__no_values():
+    assert 0 == percentile([], 50)
+
+
+def test_load_generator__without_duration_or_requests__raises_valueerror(scenario):
+    with pytest.raises(ValueError):
+        LoadGenerator(scenario)
+
+
+def test_load_generator__against_local_server(scenario):
+    report = LoadGenerator(scenario, concurrency=4, requests=200).run()
+
+    assert 200 == report['requests']
+    assert 0 < report['errors'] < 200
+    assert {'404': report['errors']} == report['errors_by_status']
+    assert report['latency_ms']['p50'] <= report['latency_ms']['p99'] <= report['latency_ms']['max']
+    assert 200 == report['connections']['requests']
+    assert report['connections']['opened'] <= 4
+    assert 'requests:    200' in format_report(report)
+
+
+def test_load_generator__rps_paces_the_requests(scenario):
+    report = LoadGenerator(scenario, concurrency=2, rps=100, requests=20).run()
+
+    assert 20 == report['requests']
+    assert 0.18 <= report['duration_s']
+
+
+def test_load_generator__timeout_defaults_to_finite(scenario):
+    del scenario['timeout']
+
+    load_generator = LoadGenerator(scenario, requests=1)
+
+    assert DEFAULT_TIMEOUT == load_generator._client._request_handler._timeout
+
+
+def test_load_generator__rps_overload__latency_includes_queueing(scenario):
+    load_generator = LoadGenerator(scenario, concurrency=1, rps=100, requests=10)
+    load_generator._client.perform_request = lambda *args, **kwargs: time.sleep(0.05)
+
+    report = load_generator.run()
+
+    # the last call is scheduled at 90ms but can only be sent after the previous 9 calls took 450ms
+    assert report['latency_ms']['max'] >= 300
+
+
+def test_main(scenario, tmp_path, capsys):
+    path = tmp_path / 'scenario.json'
+    path.write_text(json.dumps(scenario))
+
+    main([str(path), '--requests', '10', '--concurrency', '2'])
+
+    assert 'requests:    10 in' in capsys.readouterr().out
+
+
+def test_main__json_report(scenario, tmp_path, capsys):
+    path = tmp_path / 'scenario.json'
+    path.write_text(json.dumps(scenario))
+
+    main([str(path), '--requests', '10', '--concurrency', '2', '--json'])
+
+    assert 10 == json.loads(capsys.readouterr().out)['requests']
+
+
+def test_main__without_duration_or_requests__exits(scenario, tmp_path):
+    path = tmp_path / 'scenario.json'
+    path.write_text(json.dumps(scenario))
+
+    with pytest.raises(SystemExit):
+        main([str(path)])
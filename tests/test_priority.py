@@ -0,0 +1,126 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from rest_client import RequestHandler, Requestor
+from rest_client.errors import ConcurrencyLimitExceeded
+from rest_client.priority import PriorityDispatcher
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+def _wait_until(condition, timeout=5):
+    started = time.monotonic()
+    while not condition():
+        assert time.monotonic() - started < timeout
+        time.sleep(0.001)
+
+
+def test_dispatcher__unknown_priority__raises_valueerror():
+    with pytest.raises(ValueError):
+        PriorityDispatcher(weights={'a': 1}, default_priority='b')
+
+    with pytest.raises(ValueError):
+        PriorityDispatcher(weights={'a': 1}).acquire('b')
+
+
+def test_dispatcher__slots_are_granted_proportionally_to_the_weights():
+    dispatcher = PriorityDispatcher(weights={'interactive': 3, 'batch': 1}, max_concurrency=1)
+    dispatched = []
+
+    def request(priority):
+        with dispatcher.slot(priority):
+            dispatched.append(priority)
+
+    dispatcher.acquire()
+    threads = [threading.Thread(target=request, args=(priority,))
+               for priority in ['batch'] * 8 + ['interactive'] * 8]
+    for thread in threads:
+        thread.start()
+    _wait_until(lambda: 16 == sum(lane['queued'] for lane in dispatcher.metrics().values()))
+
+    dispatcher.release()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert 6 == dispatched[:8].count('interactive')
+    assert 0 == dispatcher.in_flight
+
+
+def test_dispatcher__metrics():
+    dispatcher = PriorityDispatcher(max_concurrency=2)
+
+    with dispatcher.slot('batch'):
+        with dispatcher.slot():
+            assert 2 == dispatcher.in_flight
+
+    metrics = dispatcher.metrics()
+    assert 1 == metrics['interactive']['requests']
+    assert 1 == metrics['batch']['requests']
+    assert 0 == metrics['batch']['queued']
+    assert 0 == dispatcher.in_flight
+
+
+def test_dispatcher__no_slot_within_max_wait__raises_concurrencylimitexceeded():
+    dispatcher = PriorityDispatcher(max_concurrency=1, max_wait=0.01)
+    dispatcher.acquire()
+
+    with pytest.raises(ConcurrencyLimitExceeded):
+        dispatcher.acquire('batch')
+
+    assert 0 == dispatcher.metrics()['batch']['queued']
+
+    dispatcher.release()
+    assert 0 == dispatcher.in_flight
+
+
+def test_request_handler__request_is_performed_within_a_slot_of_its_priority():
+    mock_client = Mock()
+    dispatcher = PriorityDispatcher()
+
+    client = RequestHandler('some_host.com', timeout=10, dispatcher=dispatcher,
+                            request_handler_maker=Mock(return_value=mock_client))
+    client.get('endpoint', priority='batch')
+
+    mock_client.get.assert_called_once_with('https://some_host.com/endpoint', params=None, timeout=10)
+    assert 1 == dispatcher.metrics()['batch']['requests']
+
+
+def test_requestor__priority_is_passed_to_the_request_handler():
+    mock_request_handler = Mock()
+
+    requestor = Requestor(request_handler=mock_request_handler)
+    requestor._do_request('POST', 'path', json={}, priority='batch')
+
+    mock_request_handler.post.assert_called_once_with('path', json={}, priority='batch')
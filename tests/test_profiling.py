@@ -0,0 +1,148 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from rest_client import Requestor, RequestHandler
+from rest_client.errors import APIError
+from rest_client.priority import PriorityDispatcher
+from rest_client.profiling import Profiler
+from tests.utils import TestModel
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+def _make_requestor(profiler, status_code=200, content=b'{"a": 1, "b": 2}', elapsed=timedelta(milliseconds=1)):
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    response.json = Mock(return_value={'a': 1, 'b': 2})
+    response.elapsed = elapsed
+    response.request.body = b'{"c": 3}'
+
+    mock_request_handler = Mock()
+    mock_request_handler.post = Mock(return_value=response)
+
+    return Requestor(request_handler=mock_request_handler, profiler=profiler)
+
+
+def test_profiler__sampled_call__phases_and_sizes_are_recorded():
+    profiler = Profiler(sample_rate=1, slow_threshold=None)
+    requestor = _make_requestor(profiler)
+
+    result = requestor.perform_request('POST', 'path', json={'c': 3}, response_class=TestModel)
+
+    assert TestModel(a=1, b=2) == result
+    assert 1 == len(profiler.records)
+
+    record = profiler.records[0].to_dict()
+    assert 'POST' == record['method']
+    assert 'path' == record['path']
+    assert 200 == record['status_code']
+    assert {'send_wait', 'receive', 'json_decode', 'from_json'} == set(record['phases_ms'])
+    assert 8 == record['request_bytes']
+    assert 16 == record['response_bytes']
+    assert sum(record['phases_ms'].values()) <= record['duration_ms']
+
+
+def test_profiler__transport_without_elapsed__request_phase_is_recorded():
+    profiler = Profiler(sample_rate=1, slow_threshold=None)
+    requestor = _make_requestor(profiler, elapsed=None)
+
+    requestor.perform_request('POST', 'path')
+
+    assert {'request', 'json_decode', 'from_json'} == set(profiler.records[0].phases)
+
+
+def test_profiler__unsampled_call__is_not_recorded():
+    profiler = Profiler(sample_rate=0, slow_threshold=None)
+    requestor = _make_requestor(profiler)
+
+    requestor.perform_request('POST', 'path')
+
+    assert 0 == len(profiler.records)
+
+
+@pytest.mark.parametrize('sample_rate, expected_phases', [
+    (0, {}),
+    (1, {'send_wait', 'receive'}),
+])
+def test_profiler__slow_call__is_logged(caplog, sample_rate, expected_phases):
+    profiler = Profiler(sample_rate=sample_rate, slow_threshold=0)
+    requestor = _make_requestor(profiler, status_code=500)
+
+    with caplog.at_level(logging.WARNING, logger='rest_client.profiling'):
+        with pytest.raises(APIError):
+            requestor.perform_request('POST', 'path')
+
+    assert 1 == len(caplog.records)
+    assert caplog.records[0].getMessage().startswith('Slow call: POST path took')
+
+    profile = caplog.records[0].rest_client_profile
+    assert set(expected_phases) == set(profile['phases_ms'])
+    assert 500 == profile['status_code']
+    assert 16 == profile['response_bytes']
+    assert 8 == profile['request_bytes']
+    assert profile['duration_ms'] >= 0
+
+
+def test_profiler__fast_call__is_not_logged(caplog):
+    profiler = Profiler(sample_rate=1, slow_threshold=10)
+    requestor = _make_requestor(profiler)
+
+    with caplog.at_level(logging.WARNING, logger='rest_client.profiling'):
+        requestor.perform_request('POST', 'path')
+
+    assert [] == caplog.records
+
+
+def test_profiler__queued_call__queue_wait_is_recorded_apart_from_the_request():
+    mock_client = Mock()
+    mock_client.post = Mock(side_effect=lambda *args, **kwargs: time.sleep(0.2) or
+                            Mock(status_code=200, content=b'', elapsed=None))
+    request_handler = RequestHandler('some_host.com', dispatcher=PriorityDispatcher(max_concurrency=1),
+                                     request_handler_maker=Mock(return_value=mock_client))
+    profiler = Profiler(sample_rate=1, slow_threshold=None)
+    requestor = Requestor(request_handler=request_handler, profiler=profiler)
+
+    busy = threading.Thread(target=request_handler.post, args=('path',))
+    busy.start()
+    time.sleep(0.05)
+    requestor.perform_request('POST', 'path')
+    busy.join()
+
+    phases = profiler.records[0].phases
+    assert phases['queue_wait'] >= 0.1
+    assert 0.15 <= phases['request'] < 0.3
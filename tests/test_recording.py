@@ -0,0 +1,146 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from rest_client import RequestHandler, Requestor
+from rest_client.recording import RecordingSession, ReplaySession, RecordingNotFound, make_key, MAGIC, \
+    _RECORD_HEADER
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+def _make_response(status_code, content, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {'Content-Type': 'application/json'}
+
+    return response
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = str(tmp_path / 'traffic.rec')
+
+    mock_session = Mock()
+    mock_session.get = Mock(side_effect=[_make_response(200, b'{"a": 1}'), _make_response(200, b'{"a": 2}')])
+    mock_session.post = Mock(return_value=_make_response(404, b'not found', {'Content-Type': 'text/plain'}))
+
+    with RecordingSession(path, session=mock_session) as session:
+        handler = RequestHandler('some_host.com', request_handler_maker=lambda: session)
+        handler.get('models', params={'b': 2, 'a': 1})
+        handler.get('models', params={'a': 1, 'b': 2})
+        handler.post('models', json={'a': 1})
+
+    return path
+
+
+@pytest.mark.parametrize('params_1, params_2, expected_equal', [
+    ({'a': 1, 'b': 2}, {'b': 2, 'a': 1}, True),
+    ({'a': 1}, {'a': 2}, False),
+    ([('a', 1)], [('a', 1)], True),
+])
+def test_make_key(params_1, params_2, expected_equal):
+    key_1 = make_key('GET', 'http://some_host.com/', params=params_1)
+    key_2 = make_key('GET', 'http://some_host.com/', params=params_2)
+
+    assert expected_equal == (key_1 == key_2)
+
+
+def test_recording_session__attributes_are_delegated_to_the_session():
+    mock_session = Mock()
+
+    session = RecordingSession('/dev/null', session=mock_session)
+    session.auth = ('user', 'pass')
+    session.verify = False
+    session.mount('https://', 'adapter')
+    session.close()
+
+    assert ('user', 'pass') == mock_session.auth
+    assert mock_session.verify is False
+    mock_session.mount.assert_called_once_with('https://', 'adapter')
+
+
+def test_replay_session__serves_the_recorded_responses_in_turn(recording):
+    handler = RequestHandler('some_host.com', request_handler_maker=lambda: ReplaySession(recording))
+
+    responses = [handler.get('models', params={'a': 1, 'b': 2}) for _ in range(3)]
+
+    assert [{'a': 1}, {'a': 2}, {'a': 1}] == [response.json() for response in responses]
+    assert 'application/json' == responses[0].headers['content-type']
+
+
+def test_replay_session__through_requestor(recording):
+    handler = RequestHandler('some_host.com', request_handler_maker=lambda: ReplaySession(recording))
+    requestor = Requestor(handler)
+
+    assert {'a': 1} == requestor.perform_request('GET', 'models', extra_params={'a': 1, 'b': 2})
+
+
+def test_replay_session__error_response(recording):
+    response = ReplaySession(recording).post('https://some_host.com/models', json={'a': 1})
+
+    assert 404 == response.status_code
+    assert 'not found' == response.text
+
+
+def test_replay_session__unknown_request__raises_recordingnotfound(recording):
+    with pytest.raises(RecordingNotFound):
+        ReplaySession(recording).get('https://some_host.com/other')
+
+
+def test_replay_session__invalid_file__raises_valueerror(tmp_path):
+    path = tmp_path / 'invalid.rec'
+    path.write_bytes(b'invalid')
+
+    with pytest.raises(ValueError):
+        ReplaySession(str(path))
+
+
+@pytest.mark.parametrize('last_record_bytes', [2, _RECORD_HEADER.size + 5, None])
+def test_replay_session__truncated_last_record__is_ignored(recording, last_record_bytes):
+    with open(recording, 'rb') as f:
+        data = f.read()
+    last_record = len(MAGIC)
+    for _ in range(2):
+        last_record += _RECORD_HEADER.size + sum(_RECORD_HEADER.unpack_from(data, last_record))
+    with open(recording, 'wb') as f:
+        # None: the body misses its last byte
+        f.write(data[:last_record + last_record_bytes] if last_record_bytes is not None else data[:-1])
+
+    session = ReplaySession(recording)
+
+    assert b'{"a": 1}' == session.get('https://some_host.com/models', params={'a': 1, 'b': 2}).content
+    assert b'{"a": 2}' == session.get('https://some_host.com/models', params={'a': 1, 'b': 2}).content
+    with pytest.raises(RecordingNotFound):
+        session.post('https://some_host.com/models', json={'a': 1})
+    session.close()
@@ -27,11 +27,19 @@ http://opensource.org/licenses/BSD-3-Clause
 
 Details on EUROCONTROL: http://www.eurocontrol.int
 """
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from unittest.mock import Mock
 
 import pytest
+import requests
 
-from rest_client.request_handler import RequestHandler
+from rest_client import deadlines
+from rest_client.errors import DeadlineExceeded, APITimeoutError, APIConnectionError
+from rest_client.limiter import AdaptiveLimiter
+from rest_client.priority import PriorityDispatcher
+from rest_client.request_handler import RequestHandler, _DeadlineRetry
 
 __author__ = "EUROCONTROL (SWIM)"
 
@@ -130,3 +138,245 @@ def test_get_delete__extra_parameters(method, endpoint_url, params, kwargs):
     getattr(mock_client, method).assert_called_once_with(expected_url, params=params, timeout=10, **kwargs)
 
     assert response == "data"
+
+
+@pytest.mark.parametrize('timeout, connect_timeout, read_timeout, expected_timeout', [
+    (10, None, None, 10),
+    (None, None, None, None),
+    ((1, 2), None, None, (1, 2)),
+    (10, 1, None, (1, 10)),
+    (10, None, 2, (10, 2)),
+    (None, 1, 2, (1, 2)),
+    ((1, 2), 3, None, (3, 2)),
+])
+def test_timeouts__are_passed_to_the_request(timeout, connect_timeout, read_timeout, expected_timeout):
+    mock_client = Mock()
+
+    client = RequestHandler('some_host.com', timeout=timeout, connect_timeout=connect_timeout,
+                            read_timeout=read_timeout, request_handler_maker=Mock(return_value=mock_client))
+    client.get('endpoint')
+
+    assert expected_timeout == mock_client.get.call_args[1]['timeout']
+
+
+@pytest.mark.parametrize('timeout, handler_deadline, context_deadline, expected_max_timeout', [
+    (10, 1, None, 1),
+    (10, None, 1, 1),
+    (10, 5, 1, 1),
+    (None, 1, None, 1),
+    ((10, 0.5), 1, None, (1, 0.5)),
+])
+def test_deadline__caps_the_timeout(timeout, handler_deadline, context_deadline, expected_max_timeout):
+    mock_client = Mock()
+
+    client = RequestHandler('some_host.com', timeout=timeout, deadline=handler_deadline,
+                            request_handler_maker=Mock(return_value=mock_client))
+    with deadlines.deadline(context_deadline):
+        client.get('endpoint')
+
+    timeout = mock_client.get.call_args[1]['timeout']
+    if isinstance(expected_max_timeout, tuple):
+        assert expected_max_timeout[0] - 0.1 < timeout[0] <= expected_max_timeout[0]
+        assert expected_max_timeout[1] == timeout[1]
+    else:
+        assert expected_max_timeout - 0.1 < timeout <= expected_max_timeout
+
+
+@pytest.mark.parametrize('handler_deadline, context_deadline, expected_max_ms', [
+    (2, None, 2000),
+    (None, 2, 2000),
+    (5, 2, 2000),
+])
+def test_deadline__is_forwarded_as_header(handler_deadline, context_deadline, expected_max_ms):
+    mock_client = Mock()
+
+    client = RequestHandler('some_host.com', deadline=handler_deadline,
+                            request_handler_maker=Mock(return_value=mock_client))
+    with deadlines.deadline(context_deadline):
+        client.post('endpoint', json={}, headers={'Accept': 'application/json'})
+
+    headers = mock_client.post.call_args[1]['headers']
+    assert 'application/json' == headers['Accept']
+    assert expected_max_ms - 100 < int(headers[RequestHandler.DEADLINE_HEADER]) <= expected_max_ms
+
+
+def test_deadline__no_deadline__no_header_is_sent():
+    mock_client = Mock()
+
+    client = RequestHandler('some_host.com', request_handler_maker=Mock(return_value=mock_client))
+    client.get('endpoint')
+
+    assert 'headers' not in mock_client.get.call_args[1]
+
+
+@pytest.mark.parametrize('queue', [
+    {'dispatcher': PriorityDispatcher(max_concurrency=1)},
+    {'limiter': AdaptiveLimiter(initial_limit=1)},
+])
+def test_deadline__time_spent_queued__is_deducted_from_the_timeout_and_the_header(queue):
+    mock_client = Mock()
+    mock_client.get = Mock(side_effect=lambda *args, **kwargs: time.sleep(0.3) or Mock(status_code=200))
+    client = RequestHandler('some_host.com', timeout=10, request_handler_maker=Mock(return_value=mock_client),
+                            **queue)
+
+    busy = threading.Thread(target=client.get, args=('endpoint',))
+    busy.start()
+    time.sleep(0.05)
+    with deadlines.deadline(1):
+        client.get('endpoint')
+    busy.join()
+
+    kwargs = mock_client.get.call_args[1]
+    assert kwargs['timeout'] <= 0.8
+    assert int(kwargs['headers'][RequestHandler.DEADLINE_HEADER]) <= 800
+
+
+def test_deadline__expired__raises_deadlineexceeded_without_performing_the_request():
+    mock_client = Mock()
+
+    client = RequestHandler('some_host.com', request_handler_maker=Mock(return_value=mock_client))
+
+    with deadlines.deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            client.get('endpoint')
+
+    mock_client.get.assert_not_called()
+
+
+def test_deadline__request_error_after_the_deadline__raises_deadlineexceeded():
+    def slow_request(*args, **kwargs):
+        time.sleep(0.02)
+        raise requests.exceptions.ConnectTimeout()
+
+    mock_client = Mock()
+    mock_client.get = Mock(side_effect=slow_request)
+
+    client = RequestHandler('some_host.com', deadline=0.01, request_handler_maker=Mock(return_value=mock_client))
+
+    with pytest.raises(DeadlineExceeded) as e:
+        client.get('endpoint')
+    assert isinstance(e.value.__cause__, requests.exceptions.ConnectTimeout)
+
+
+@pytest.mark.parametrize('error, expected_error_class', [
+    (requests.exceptions.ConnectionError(), APIConnectionError),
+    (requests.exceptions.ConnectTimeout(), APITimeoutError),
+    (requests.exceptions.ReadTimeout(), APITimeoutError),
+])
+@pytest.mark.parametrize('deadline', [None, 10])
+def test_request_error__is_raised_as_apierror(error, expected_error_class, deadline):
+    mock_client = Mock()
+    mock_client.get = Mock(side_effect=error)
+
+    client = RequestHandler('some_host.com', deadline=deadline, request_handler_maker=Mock(return_value=mock_client))
+
+    with pytest.raises(expected_error_class) as e:
+        client.get('endpoint')
+    assert error == e.value.__cause__
+    assert not isinstance(e.value, DeadlineExceeded)
+
+
+def test_request_error__other_errors_are_reraised():
+    mock_client = Mock()
+    mock_client.get = Mock(side_effect=requests.exceptions.TooManyRedirects())
+
+    client = RequestHandler('some_host.com', request_handler_maker=Mock(return_value=mock_client))
+
+    with pytest.raises(requests.exceptions.TooManyRedirects):
+        client.get('endpoint')
+
+
+def test_deadline_retry__is_exhausted_and_does_not_back_off_beyond_the_deadline():
+    retry = _DeadlineRetry(total=10, backoff_factor=10).increment().increment()
+
+    assert not retry.is_exhausted()
+    assert 0 < retry.get_backoff_time()
+
+    with deadlines.deadline(1):
+        assert retry.get_backoff_time() <= 1
+
+    with deadlines.deadline(0):
+        assert retry.is_exhausted()
+
+
+@pytest.mark.parametrize('context_deadline, expected_max_retry_after', [
+    (None, 3),
+    (0.5, 0.5),
+])
+def test_deadline_retry__retry_after_is_capped_to_the_deadline(context_deadline, expected_max_retry_after):
+    response = Mock(headers={'Retry-After': '3'})
+
+    with deadlines.deadline(context_deadline):
+        retry_after = _DeadlineRetry(total=3).get_retry_after(response)
+
+    assert expected_max_retry_after - 0.1 < retry_after <= expected_max_retry_after
+
+
+def _start_server(handler_class):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+
+    return server
+
+
+def _stop_server(server):
+    server.shutdown()
+    server.server_close()
+
+
+def test_deadline__retry_after_response__does_not_sleep_beyond_the_deadline():
+    class RetryAfterHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(503)
+            self.send_header('Retry-After', '3')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = _start_server(RetryAfterHandler)
+    client = RequestHandler(f'127.0.0.1:{server.server_port}', https=False, retry=3, deadline=0.5)
+
+    started = time.monotonic()
+    try:
+        with pytest.raises(DeadlineExceeded):
+            client.get('endpoint')
+    finally:
+        _stop_server(server)
+
+    assert time.monotonic() - started < 1.5
+
+
+class SlowThenHangingHandler(BaseHTTPRequestHandler):
+    """Answers the first request with a 503 after 0.6s and lets the retries hang"""
+    protocol_version = 'HTTP/1.1'
+    deadline_headers = []
+
+    def do_GET(self):
+        self.deadline_headers.append(int(self.headers[RequestHandler.DEADLINE_HEADER]))
+        time.sleep(0.6 if len(self.deadline_headers) == 1 else 3)
+        self.send_response(503)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_deadline__retried_attempt__does_not_run_beyond_the_deadline():
+    SlowThenHangingHandler.deadline_headers = []
+    server = _start_server(SlowThenHangingHandler)
+    client = RequestHandler(f'127.0.0.1:{server.server_port}', https=False, retry=3, deadline=1.0)
+
+    started = time.monotonic()
+    try:
+        with pytest.raises(DeadlineExceeded):
+            client.get('endpoint')
+    finally:
+        _stop_server(server)
+
+    assert time.monotonic() - started < 1.4
+    first, retry = SlowThenHangingHandler.deadline_headers
+    assert 900 < first <= 1000
+    assert retry <= first - 500
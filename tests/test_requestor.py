@@ -31,8 +31,9 @@ from unittest.mock import Mock
 
 import pytest
 
-from rest_client import Requestor
-from rest_client.errors import APIError
+from rest_client import Requestor, deadlines
+from rest_client.errors import APIError, DeadlineExceeded
+from rest_client.profiling import Profiler
 from tests.utils import TestModel
 
 __author__ = "EUROCONTROL (SWIM)"
@@ -64,6 +65,39 @@ def test_do_request__corrent_method_is_called(method):
     called_method.assert_called_once()
 
 
+def test_do_request__no_deadline__no_header_is_sent():
+    mock_request_handler = Mock()
+
+    requestor = Requestor(request_handler=mock_request_handler)
+    requestor._do_request('GET', 'path')
+
+    mock_request_handler.get.assert_called_once_with('path', params={}, json=None)
+
+
+@pytest.mark.parametrize('profiler', [None, Profiler(sample_rate=1, slow_threshold=None)])
+def test_perform_request__on_response__is_called_with_the_raw_response(profiler):
+    response = Mock(status_code=200, content=b'{"a": 1}', elapsed=None)
+    response.json = Mock(return_value={'a': 1})
+    on_response = Mock()
+
+    requestor = Requestor(request_handler=Mock(get=Mock(return_value=response)), profiler=profiler)
+
+    assert {'a': 1} == requestor.perform_request('GET', 'path', on_response=on_response)
+    on_response.assert_called_once_with(response)
+
+
+def test_perform_request__deadline_exceeded__raises_deadlineexceeded():
+    mock_request_handler = Mock()
+
+    requestor = Requestor(request_handler=mock_request_handler)
+
+    with deadlines.deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            requestor.perform_request('GET', 'path')
+
+    mock_request_handler.get.assert_not_called()
+
+
 @pytest.mark.parametrize('status_code, should_raise', [
     (200, False),
     (201, False),
@@ -0,0 +1,163 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from rest_client import BaseModel, Requestor
+from rest_client.sync import CollectionSync
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+class Item(BaseModel):
+    def __init__(self, id, group, updated_at, deleted=False):
+        self.id = id
+        self.group = group
+        self.updated_at = updated_at
+        self.deleted = deleted
+
+    @classmethod
+    def from_json(cls, object_dict):
+        return cls(**object_dict)
+
+
+def _make_requestor(*pages):
+    responses = []
+    for page in pages:
+        response = Mock()
+        response.status_code = 200
+        response.content = page
+        response.json = Mock(return_value=page)
+        responses.append(response)
+
+    mock_request_handler = Mock()
+    mock_request_handler.get = Mock(side_effect=responses)
+
+    return Requestor(request_handler=mock_request_handler), mock_request_handler
+
+
+@pytest.fixture
+def collection():
+    requestor, request_handler = _make_requestor(
+        [{'id': 1, 'group': 'a', 'updated_at': 1}, {'id': 2, 'group': 'a', 'updated_at': 2}],
+        [{'id': 2, 'group': 'b', 'updated_at': 3}, {'id': 1, 'group': 'a', 'updated_at': 4, 'deleted': True}],
+        [],
+    )
+
+    collection = CollectionSync(requestor, 'items', Item, is_deleted=lambda item: item.deleted,
+                                extra_params={'kind': 'x'})
+    collection.add_index('group', lambda item: item.group)
+
+    return collection, request_handler
+
+
+def test_sync__only_changes_since_the_watermark_are_requested(collection):
+    collection, request_handler = collection
+
+    assert 2 == collection.sync()
+    assert 2 == collection.watermark
+    assert 2 == collection.sync()
+    assert 4 == collection.watermark
+    assert 0 == collection.sync()
+
+    assert [
+        {'kind': 'x'},
+        {'kind': 'x', 'updated_since': 2},
+        {'kind': 'x', 'updated_since': 4},
+    ] == [call[1]['params'] for call in request_handler.get.call_args_list]
+
+
+def test_sync__changes_are_merged(collection):
+    collection, _ = collection
+
+    collection.sync()
+    assert 2 == len(collection)
+    assert Item(1, 'a', 1) == collection[1]
+    assert [Item(1, 'a', 1), Item(2, 'a', 2)] == collection.find('group', 'a')
+
+    collection.sync()
+    assert 1 == len(collection)
+    assert 1 not in collection
+    assert collection.get(1) is None
+    assert Item(2, 'b', 3) == collection.get(2)
+    assert [Item(2, 'b', 3)] == list(collection)
+    assert [] == collection.find('group', 'a')
+    assert [Item(2, 'b', 3)] == collection.find('group', 'b')
+
+
+def test_add_index__existing_items_are_indexed(collection):
+    collection, _ = collection
+    collection.sync()
+
+    collection.add_index('updated_at', lambda item: item.updated_at)
+
+    assert [Item(2, 'a', 2)] == collection.find('updated_at', 2)
+
+
+def test_reset__next_sync_fetches_the_whole_collection(collection):
+    collection, request_handler = collection
+    collection.sync()
+
+    collection.reset()
+
+    assert 0 == len(collection)
+    assert collection.watermark is None
+    assert [] == collection.find('group', 'a')
+
+    collection.sync()
+    assert {'kind': 'x'} == request_handler.get.call_args[1]['params']
+
+
+def test_sync__next_watermark__cursor_is_taken_from_the_response():
+    requestor, request_handler = _make_requestor(
+        [{'id': 1, 'group': 'a', 'updated_at': 5}, {'id': 2, 'group': 'a', 'updated_at': 1}],
+        [{'id': 3, 'group': 'b', 'updated_at': 2}],
+        [],
+    )
+    responses = list(request_handler.get.side_effect)
+    for response, cursor in zip(responses, ['c1', 'c2', None]):
+        response.headers = {'X-Next-Cursor': cursor}
+    request_handler.get.side_effect = responses
+
+    collection = CollectionSync(requestor, 'items', Item, watermark_param='cursor',
+                                next_watermark=lambda response: response.headers['X-Next-Cursor'], priority='batch')
+
+    assert 2 == collection.sync()
+    assert 'c1' == collection.watermark
+    assert 1 == collection.sync()
+    assert 'c2' == collection.watermark
+    assert 0 == collection.sync()
+    assert 'c2' == collection.watermark
+
+    assert [{}, {'cursor': 'c1'}, {'cursor': 'c2'}] == \
+        [call[1]['params'] for call in request_handler.get.call_args_list]
+    assert all('batch' == call[1]['priority'] for call in request_handler.get.call_args_list)
+    assert [1, 2, 3] == sorted(item.id for item in collection)
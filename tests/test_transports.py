@@ -0,0 +1,221 @@
+"""
+Copyright 2019 EUROCONTROL
+==========================================
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+   disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following
+   disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products
+   derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+==========================================
+
+Editorial note: this license is an instance of the BSD license template as provided by the Open Source Initiative:
+http://opensource.org/licenses/BSD-3-Clause
+
+Details on EUROCONTROL: http://www.eurocontrol.int
+"""
+import socket
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from unittest.mock import Mock
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rest_client import ClientFactory, Requestor
+from rest_client.errors import APIConnectionError, APITimeoutError, DeadlineExceeded
+from rest_client.transports import HTTP2Session
+
+__author__ = "EUROCONTROL (SWIM)"
+
+
+class Client(Requestor, ClientFactory):
+    pass
+
+
+@pytest.mark.parametrize('method', ['get', 'put', 'post', 'delete'])
+def test_http2_session__request_is_delegated_to_the_client(method):
+    session = HTTP2Session()
+    session._client = Mock()
+    session._client.request = Mock(return_value='data')
+
+    response = getattr(session, method)('https://some_host.com/endpoint', params={'a': 1}, json=None, timeout=10)
+
+    session._client.request.assert_called_once_with(method.upper(), 'https://some_host.com/endpoint',
+                                                    params={'a': 1}, json=None, timeout=10)
+    assert 'data' == response
+
+
+@pytest.mark.parametrize('data, expected_kwargs', [
+    (b'bytes', {'content': b'bytes'}),
+    ('str', {'content': 'str'}),
+    ({'a': 1}, {'data': {'a': 1}}),
+    (None, {}),
+])
+def test_http2_session__data_is_translated_to_httpx_arguments(data, expected_kwargs):
+    session = HTTP2Session()
+    session._client = Mock()
+
+    session.post('https://some_host.com/endpoint', data=data, allow_redirects=False)
+
+    session._client.request.assert_called_once_with('POST', 'https://some_host.com/endpoint',
+                                                    follow_redirects=False, **expected_kwargs)
+
+
+@pytest.mark.parametrize('retry, expected_retries', [
+    (Retry(total=3), 3),
+    (0, 0),
+])
+def test_http2_session__mount_keeps_the_retries(retry, expected_retries):
+    session = HTTP2Session()
+
+    session.mount('https://', HTTPAdapter(max_retries=retry))
+
+    assert expected_retries == session._retries
+
+
+def test_http2_session__tuple_timeout__bounds_the_wait_for_a_pooled_connection():
+    pytest.importorskip('httpx')
+    session = HTTP2Session()
+    session._client = Mock()
+
+    session.get('https://some_host.com/endpoint', timeout=(1, 5))
+
+    timeout = session._client.request.call_args[1]['timeout']
+    assert (1, 5, None, 1) == (timeout.connect, timeout.read, timeout.write, timeout.pool)
+
+
+def test_http2_session__http1_fallback__concurrent_requests_are_not_serialized():
+    pytest.importorskip('h2')
+
+    class SlowHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(0.3)
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    client = Client.create(f'127.0.0.1:{server.server_port}', https=False, http2=True)
+
+    started = time.monotonic()
+    try:
+        threads = [threading.Thread(target=client.perform_request, args=('GET', 'endpoint')) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert time.monotonic() - started < 1
+
+
+def test_http2_session__missing_httpx__raises_importerror(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'httpx', None)
+
+    with pytest.raises(ImportError) as e:
+        HTTP2Session().client
+    assert 'httpx[http2]' in str(e.value)
+
+
+def test_client_factory__http2__uses_http2_session():
+    client = Client.create('some_host.com', http2=True, username='user', password='pass')
+
+    session = client._request_handler._request_handler
+    assert isinstance(session, HTTP2Session)
+    assert ('user', 'pass') == session.auth
+
+
+def test_client_factory__request_handler_maker_takes_precedence_over_http2():
+    mock_session = Mock()
+
+    client = Client.create('some_host.com', http2=True, request_handler_maker=Mock(return_value=mock_session))
+
+    assert mock_session == client._request_handler._request_handler
+
+
+def test_client_factory__timeout_is_finite_by_default():
+    client = Client.create('some_host.com', request_handler_maker=Mock)
+
+    assert 30 == client._request_handler._timeout
+
+
+@pytest.mark.parametrize('httpx_error, expected_error', [
+    ('ConnectTimeout', requests.exceptions.ConnectTimeout),
+    ('ReadTimeout', requests.exceptions.ReadTimeout),
+    ('PoolTimeout', requests.exceptions.ReadTimeout),
+    ('ConnectError', requests.exceptions.ConnectionError),
+    ('RemoteProtocolError', requests.exceptions.RequestException),
+])
+def test_http2_session__httpx_errors_are_translated_to_requests_errors(httpx_error, expected_error):
+    httpx = pytest.importorskip('httpx')
+    session = HTTP2Session()
+    session._client = Mock()
+    session._client.request = Mock(side_effect=getattr(httpx, httpx_error)('error'))
+
+    with pytest.raises(expected_error) as e:
+        session.get('https://some_host.com/endpoint')
+    assert isinstance(e.value.__cause__, httpx.TransportError)
+
+
+def test_http2_session__other_errors_are_not_translated():
+    session = HTTP2Session()
+    session._client = Mock()
+    session._client.request = Mock(side_effect=ValueError('error'))
+
+    with pytest.raises(ValueError):
+        session.get('https://some_host.com/endpoint')
+
+
+def test_client_factory__http2__connection_error__raises_api_connection_error():
+    pytest.importorskip('h2')
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        port = sock.getsockname()[1]
+
+    client = Client.create(f'localhost:{port}', https=False, http2=True, timeout=1)
+
+    with pytest.raises(APIConnectionError):
+        client.perform_request('GET', 'endpoint')
+
+
+@pytest.mark.parametrize('kwargs, expected_error', [
+    ({'timeout': 0.2}, APITimeoutError),
+    ({'deadline': 0.2}, DeadlineExceeded),
+])
+def test_client_factory__http2__slow_server__raises_api_errors(kwargs, expected_error):
+    pytest.importorskip('h2')
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        sock.listen()
+        port = sock.getsockname()[1]
+
+        client = Client.create(f'localhost:{port}', https=False, http2=True, **kwargs)
+
+        with pytest.raises(expected_error):
+            client.perform_request('GET', 'endpoint')